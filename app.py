@@ -191,12 +191,24 @@ with tabs[0]:
         progress_bar = st.progress(0)
         status_text = st.empty()
 
+        findings_box = st.empty()
+        early_findings = []
+
         def progress_callback(percent, message):
             progress_bar.progress(percent / 100)
             status_text.markdown(
                 f"🔄 **{message}** — **{percent}%**"
             )
 
+        def finding_callback(clause):
+            # High-risk clauses appear here while the analysis continues
+            risk = clause.get("risk", {})
+            reason = risk.get("risk_reason") or risk.get("explanation", "")
+            early_findings.append(f"- 🔴 **Clause {clause['clause_id']}** — {reason}")
+            findings_box.warning(
+                "**High-risk clauses found so far:**\n" + "\n".join(early_findings)
+            )
+
         run_clicked = st.button("⚡Run Compliance Pipeline")
 
         if run_clicked and not st.session_state.pipeline_done:
@@ -204,7 +216,8 @@ with tabs[0]:
                 with st.spinner("Running compliance pipeline…"):
                     run_pipeline(
                         pdf_path,
-                        progress_callback=progress_callback
+                        progress_callback=progress_callback,
+                        finding_callback=finding_callback
                     )
 
                 st.session_state.pipeline_done = True
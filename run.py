@@ -2,6 +2,7 @@
 
 import os
 import json
+import uuid
 import argparse
 from dotenv import load_dotenv
 from datetime import datetime
@@ -10,19 +11,29 @@ from datetime import datetime
 # Utils
 # --------------------------------------------------
 from src.utils.pdf_extract import extract_pdf
-from src.utils.cleaner import normalize_text, chunk_text
+from src.utils.cleaner import normalize_text, chunk_by_clauses
 from src.utils.annotate_csv import convert_m2_json_to_csv
 
-from src.clause_engine.clause_extractor import extract_clauses
-from src.risk_engine.risk_engine import assess_clauses
+from src.clause_engine.clause_extractor import (
+    extract_clauses_chunked,
+    extract_clauses_stream,
+    extract_clauses_segmented
+)
+from src.clause_engine.clause_dedup import ClauseDeduplicator, expand_duplicates
+from src.risk_engine.risk_engine import assess_clauses, assess_clauses_stream
 
-from src.regulatory.gdpr_live_tracker import detect_gdpr_changes
-from src.regulatory.hipaa_live_tracker import detect_hipaa_changes
+from src.regulatory.regulatory_daemon import (
+    REGULATORY_POLLER_ENABLED,
+    start_poller,
+    get_cached_state
+)
 
 from src.contract_modification.gap_analyzer import identify_high_risk_clauses
-from src.contract_modification.amendment_generator import generate_amendment
+from src.contract_modification.amendment_generator import AmendmentQueue
+from src.contract_modification.contract_rebuilder import build_span_index, splice_amendments
 from src.utils.pdf_writer import write_contract_pdf
 
+from src.portfolio.portfolio_store import record_run
 from src.integrations.email_notifier import notify_once
 from src.integrations.slack_notifier import notify_slack
 from src.integrations.google_sheets.gsheet_writers import (
@@ -53,30 +64,31 @@ def safe_notify_slack(payload):
         print("⚠️ Slack notification failed:", e)
 
 
-import re
-
-def apply_amendments_to_original_text(original_text, amendments):
-    updated_text = original_text
-
-    for clause_id, amended_clause in amendments.items():
-        pattern = rf"(^|\n){re.escape(clause_id)}\.?\s+.*?(?=\n\d+(?:\.\d+)*\.?\s|\Z)"
-
-        updated_text, count = re.subn(
-            pattern,
-            f"\n{amended_clause.strip()}",
-            updated_text,
-            flags=re.DOTALL
-        )
-
-        if count == 0:
-            print(f"⚠️ Clause {clause_id} NOT replaced (pattern mismatch)")
-        else:
-            print(f"✅ Clause {clause_id} replaced successfully")
+def notify_regulatory_updates(results):
+    # Runs after each background poll, so a change is announced once
+    for name, updates in results.items():
+        if updates.get("has_new_updates") and updates.get("message"):
+            safe_notify_slack({
+                "event_type": "REGULATORY_UPDATE",
+                "severity": "INFO",
+                "summary": f"{name} regulatory update detected",
+                "details": {
+                    "message": updates.get("message")
+                },
+                "action_required": "Review impacted contracts",
+                "source_module": f"{name} Live Tracker"
+            })
 
-    return updated_text
 
+def run_pipeline(pdf_path, progress_callback=None, finding_callback=None, force_regenerate=False):
+    """
+    finding_callback(clause) is called for each high-risk clause the
+    moment its assessment completes, before the rest of the contract is
+    done, so a UI can show findings incrementally.
 
-def run_pipeline(pdf_path, progress_callback=None):
+    force_regenerate=True writes every amendment fresh instead of reusing
+    cached amendments for identical clause / reason / regulation.
+    """
     try:
         print("\n==============================")
         print(" AI-POWERED CONTRACT COMPLIANCE PIPELINE ")
@@ -100,35 +112,119 @@ def run_pipeline(pdf_path, progress_callback=None):
         clean_text = normalize_text(raw_text)
         original_header = clean_text.split("\n\n")[0].strip()
 
+        base_name = os.path.basename(pdf_path).replace(".pdf", "")
+        contract_id = base_name.upper()
+
         # --------------------------------------------------
         # STEP 3: CLAUSE EXTRACTION
         # --------------------------------------------------
         print("Step 3: Extracting clauses")
-        if len(clean_text) > MAX_LENGTH:
+        update_progress(30, "Extracting Clauses")
+
+        # Numbered contracts of any size are split locally; the LLM only classifies
+        clause_source = extract_clauses_segmented(clean_text)
+        segmented = clause_source is not None
+
+        if clause_source is None and len(clean_text) > MAX_LENGTH:
             print("Large contract detected → chunking enabled")
-            chunks = chunk_text(clean_text, max_tokens=1500)
-            clauses = []
-
-            for idx, chunk in enumerate(chunks):
-                print(f" - Processing chunk {idx + 1}/{len(chunks)}")
-                extracted = extract_clauses(chunk)
-                for c in extracted:
-                    c["clause_id"] = f"chunk{idx}_{c.get('clause_id', 'c')}"
-                clauses.extend(extracted)
-        else:
-            update_progress(30, "Extracting Clauses")
-            clauses = extract_clauses(clean_text)
+            chunks = chunk_by_clauses(clean_text)
+            print(f" - Extracting {len(chunks)} chunks in parallel")
 
-        print(f"Total clauses extracted: {len(clauses)}")
+            def on_chunk_done(done, total, idx):
+                update_progress(
+                    30 + int(20 * done / total),
+                    f"Extracting Clauses (chunk {done}/{total})"
+                )
+
+            clause_source = extract_clauses_chunked(chunks, on_chunk_done=on_chunk_done)
+
+        elif clause_source is None:
+            # Clauses stream from the LLM and are assessed as each one is emitted
+            print("No numbered clause headings found → full LLM extraction")
+            clause_source = extract_clauses_stream(clean_text)
 
         # --------------------------------------------------
         # STEP 4: RISK ANALYSIS
         # --------------------------------------------------
         print("Step 4: Performing LLM-based risk assessment")
         update_progress(50, "Analysing Risks")
-        assessed_clauses = assess_clauses(clauses)
 
-        base_name = os.path.basename(pdf_path).replace(".pdf", "")
+        # Chunk overlap and LLM extraction can emit the same clause twice;
+        # those copies are assessed once and get the kept clause's result.
+        # Segmented clauses are distinct sections and are never merged.
+        dedup = ClauseDeduplicator()
+        if not segmented and isinstance(clause_source, list):
+            clause_source = list(dedup.filter(clause_source))
+        elif not segmented:
+            clause_source = dedup.filter(clause_source)
+        early_findings = []
+
+        # High-risk clauses are amended while the rest are still assessed
+        amendment_queue = AmendmentQueue(force_regenerate=force_regenerate)
+
+        def on_result(clause):
+            # Publish high-risk findings as soon as they exist
+            risk = clause.get("risk") or {}
+            if not isinstance(risk, dict) or risk.get("severity") != "high":
+                return
+
+            early_findings.append(clause["clause_id"])
+            print(f"⚠️ High-risk clause found: {clause['clause_id']}")
+            if finding_callback:
+                finding_callback(clause)
+
+            if amendment_queue.submit(clause):
+                print(f" - Queued HIGH-RISK clause {clause['clause_id']} for amendment")
+
+            if len(early_findings) == 1:
+                safe_notify_slack({
+                    "event_type": "HIGH_RISK_CLAUSE",
+                    "severity": "HIGH",
+                    "contract": {"name": base_name},
+                    "summary": "First high-risk clause found (analysis still running)",
+                    "details": {
+                        "clause_id": clause["clause_id"],
+                        "reason": risk.get("risk_reason") or risk.get("explanation", "")
+                    },
+                    "action_required": "Review clause; full report follows",
+                    "source_module": "Risk Engine"
+                })
+
+        if isinstance(clause_source, list):
+            def on_clause_done(done, total, clause_id):
+                update_progress(
+                    50 + int(20 * done / total),
+                    f"Analysing Risks ({done}/{total})"
+                )
+
+            assessed_clauses = assess_clauses(
+                clause_source,
+                on_clause_done=on_clause_done,
+                on_result=on_result,
+                contract_id=contract_id
+            )
+        else:
+            assessed_clauses = assess_clauses_stream(
+                clause_source,
+                on_result=on_result,
+                contract_id=contract_id
+            )
+        if dedup.duplicates:
+            print(f"Near-duplicate clauses assessed once: {len(dedup.duplicates)}")
+            assessed_clauses = expand_duplicates(assessed_clauses, dedup.copies)
+        print(f"Total clauses extracted: {len(assessed_clauses)}")
+
+        rule_decided = sum(
+            1 for c in assessed_clauses
+            if isinstance(c.get("risk"), dict) and c["risk"].get("_llm_used") == "rules"
+        )
+        print(f"Decided by rule engine (no LLM call): {rule_decided}/{len(assessed_clauses)}")
+
+        reused = sum(
+            1 for c in assessed_clauses
+            if isinstance(c.get("risk"), dict) and c["risk"].get("reused_from")
+        )
+        print(f"Reused from earlier contracts (risk cache): {reused}/{len(assessed_clauses)}")
         m2_json = os.path.join(OUTPUT_DIR, f"{base_name}_m2_output.json")
 
         with open(m2_json, "w", encoding="utf-8") as f:
@@ -142,36 +238,31 @@ def run_pipeline(pdf_path, progress_callback=None):
         # --------------------------------------------------
         # STEP 5: LIVE REGULATORY TRACKING
         # --------------------------------------------------
-        print("\nStep 5: Fetching live regulatory updates")
-        gdpr_updates = detect_gdpr_changes()
-        hipaa_updates = detect_hipaa_changes()
-
-        print("GDPR:", gdpr_updates.get("message"))
-        print("HIPAA:", hipaa_updates.get("message"))
-
-        if gdpr_updates.get("changed") and gdpr_updates.get("message"):
-            safe_notify_slack({
-                "event_type": "REGULATORY_UPDATE",
-                "severity": "INFO",
-                "summary": "GDPR regulatory update detected",
-                "details": {
-                    "message": gdpr_updates.get("message")
-                },
-                "action_required": "Review impacted contracts",
-                "source_module": "GDPR Live Tracker"
-            })
-
-        if hipaa_updates.get("changed") and hipaa_updates.get("message"):
-            safe_notify_slack({
-                "event_type": "REGULATORY_UPDATE",
-                "severity": "INFO",
-                "summary": "HIPAA regulatory update detected",
-                "details": {
-                    "message": hipaa_updates.get("message")
-                },
-                "action_required": "Review impacted contracts",
-                "source_module": "HIPAA Live Tracker"
-            })
+        print("\nStep 5: Reading live regulatory state")
+
+        # Polling happens in the background; the pipeline never waits on it
+        if REGULATORY_POLLER_ENABLED:
+            start_poller(on_updates=notify_regulatory_updates)
+
+        regulatory_state = get_cached_state()
+
+        for name, updates in regulatory_state["results"].items():
+            print(f"{name}:", updates.get("message"))
+
+        if regulatory_state["fetched_at"] is None:
+            print("⚠️ No regulatory poll completed yet")
+        elif regulatory_state["stale"]:
+            print(f"⚠️ Regulatory state is stale (last polled {regulatory_state['fetched_at']})")
+
+        regulatory_status = {
+            "fetched_at": regulatory_state["fetched_at"],
+            "age_seconds": regulatory_state["age_seconds"],
+            "stale": regulatory_state["stale"],
+            "sources": {
+                name: updates.get("message")
+                for name, updates in regulatory_state["results"].items()
+            }
+        }
 
 
         # --------------------------------------------------
@@ -193,6 +284,7 @@ def run_pipeline(pdf_path, progress_callback=None):
                     "clause_type": risk.get("clause_type", "Unknown"),
                     "severity": severity,
                     "explanation": risk.get("explanation", ""),
+                    "duplicate_ids": clause.get("duplicate_ids", []),
                     "source": "risk_engine"
                 })
 
@@ -204,8 +296,6 @@ def run_pipeline(pdf_path, progress_callback=None):
 
         print("Compliance issues detected:", compliance_report["total_issues_detected"])
 
-        contract_id = base_name.upper()
-
         overall_status = (
             "NON-COMPLIANT"
             if any(i["severity"] in ["high", "critical"] for i in compliance_report["issues"])
@@ -277,32 +367,27 @@ def run_pipeline(pdf_path, progress_callback=None):
         if not high_risk:
             print("No high-risk clauses found — no amendments will be generated. (Severity check is case-insensitive)")
 
-        for clause in high_risk:
-            risk = clause.get("risk", {})
-
-            # HARD GATE — rewrite ONLY true HIGH risk
-            if risk.get("severity") != "high":
-                continue
+        # Amendments were queued during risk analysis; wait for the whole set
+        print(f" - Waiting for {len(amendment_queue)} queued amendments")
 
-            risk_reason = risk.get("risk_reason") or risk.get("explanation")
-            if not risk_reason:
-                print(f"⚠️ Skipping clause {clause['clause_id']} — no clear risk reason")
-                continue
+        clauses_by_id = {c["clause_id"]: c for c in assessed_clauses}
 
+        for clause, amendment in amendment_queue.results():
             cid = clause["clause_id"]
-            print(f" - Amending HIGH-RISK clause {cid}")
-
-            amended_body = generate_amendment(
-                original_clause=clause["clause_text"],
-                reason=risk_reason,
-                regulation=risk.get("regulation_violations", "General Compliance")
-            )
+            amended_body = amendment["text"]
+            print(f" - Amended HIGH-RISK clause {cid} ({amendment['source']})")
 
             # PRESERVE CLAUSE HEADING (number + title)
             heading = clause["clause_text"].split("\n", 1)[0].strip()
 
             amendments[cid] = f"{heading}\n{amended_body}"
 
+            # Copies of the clause elsewhere in the contract get the same amendment
+            for dup_id in clause.get("duplicate_ids", []):
+                dup_text = clauses_by_id.get(dup_id, {}).get("clause_text") or clause["clause_text"]
+                dup_heading = dup_text.split("\n", 1)[0].strip()
+                amendments[dup_id] = f"{dup_heading}\n{amended_body}"
+
 
             # Debug: log amendment preview and whether it differs from original
             try:
@@ -320,7 +405,8 @@ def run_pipeline(pdf_path, progress_callback=None):
                 contract_id=contract_id,
                 target=cid,
                 status="Completed",
-                triggered_by="Amendment Engine"
+                triggered_by="Amendment Engine",
+                source=amendment["source"]
             )
 
         if not amendments:
@@ -331,11 +417,17 @@ def run_pipeline(pdf_path, progress_callback=None):
         # --------------------------------------------------
         # APPLY AMENDMENTS TO ORIGINAL CONTRACT TEXT
         # --------------------------------------------------
-        updated_contract = apply_amendments_to_original_text(
+        span_index = build_span_index(clean_text, assessed_clauses)
+        updated_contract, applied_ids, unmatched_ids = splice_amendments(
             clean_text,   # full original contract text
-            amendments    # only amended clauses
+            amendments,   # only amended clauses
+            span_index
         )
 
+        print(f"✅ {len(applied_ids)} clauses replaced")
+        for cid in unmatched_ids:
+            print(f"⚠️ Clause {cid} NOT replaced (no matching span in contract text)")
+
         # --------------------------------------------------
         # STEP 10: SAVE FINAL OUTPUTS
         # --------------------------------------------------
@@ -356,6 +448,8 @@ def run_pipeline(pdf_path, progress_callback=None):
             json.dump({
                 "compliance_report": compliance_report,
                 "amended_clauses": list(amendments.keys()),
+                "unmatched_amendments": unmatched_ids,
+                "regulatory_status": regulatory_status,
             }, f, indent=2)
 
         with open(contract_path, "w", encoding="utf-8") as f:
@@ -374,7 +468,8 @@ def run_pipeline(pdf_path, progress_callback=None):
 
         final_pipeline_result = {
             "pipeline_status": "SUCCESS",
-            "run_id": f"RUN-{contract_id}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
+            # Random suffix: two runs of one contract can start in the same second
+            "run_id": f"RUN-{contract_id}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}",
 
             # FOR EMAIL
             "contract_name": base_name,
@@ -408,6 +503,24 @@ def run_pipeline(pdf_path, progress_callback=None):
             "error_summary": None
         }
 
+        # ---- Portfolio store (queryable across contracts) ----
+        try:
+            record_run(
+                run_id=final_pipeline_result["run_id"],
+                contract={
+                    "contract_id": contract_id,
+                    "contract_name": base_name,
+                    "source_path": pdf_path,
+                    "overall_status": overall_status,
+                    "severity": severity
+                },
+                clauses=assessed_clauses,
+                issues=compliance_report["issues"],
+                amendments=amendments
+            )
+        except Exception as store_err:
+            print("⚠️ Portfolio store update failed:", store_err)
+
         try:
             notify_once(final_pipeline_result)
         except Exception as email_err:
@@ -477,5 +590,11 @@ if __name__ == "__main__":
         help="Path to contract PDF file"
     )
 
+    parser.add_argument(
+        "--force-regenerate",
+        action="store_true",
+        help="Regenerate amendments instead of reusing cached ones"
+    )
+
     args = parser.parse_args()
-    run_pipeline(args.pdf)
+    run_pipeline(args.pdf, force_regenerate=args.force_regenerate)
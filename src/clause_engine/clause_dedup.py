@@ -0,0 +1,192 @@
+# src/clause_engine/clause_dedup.py
+
+import os
+import re
+import zlib
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+# Estimated Jaccard similarity at which two clauses count as the same clause
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.85"))
+
+# Word shingle size and MinHash signature layout (bands × rows = permutations)
+DEDUP_SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", "5"))
+DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16"))
+DEDUP_ROWS = int(os.getenv("DEDUP_ROWS", "8"))
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(42)
+_A = _rng.randint(1, _PRIME, size=DEDUP_BANDS * DEDUP_ROWS).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=DEDUP_BANDS * DEDUP_ROWS).astype(np.uint64)
+
+# Leading clause numbering ("7.2", "chunk3_7.2") is not part of the content
+_NUMBERING_RE = re.compile(r"^\s*\d+(?:\.\d+)*\.?\s+")
+
+# Figures and negations change what a clause says however similar the
+# rest of the wording is ("within 24 hours" / "within 720 hours",
+# "shall notify" / "shall not notify")
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+_NEGATION_RE = re.compile(r"\b(?:not|no|never|without|nor|neither|cannot)\b|n't\b", re.IGNORECASE)
+
+
+# =====================================================
+# FINGERPRINTS
+# =====================================================
+def _shingles(text):
+    words = re.findall(r"\w+", _NUMBERING_RE.sub("", text or "").lower())
+    if len(words) < DEDUP_SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {
+        " ".join(words[i:i + DEDUP_SHINGLE_SIZE])
+        for i in range(len(words) - DEDUP_SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signature(text):
+    """
+    MinHash signature over word shingles; the fraction of equal positions
+    in two signatures estimates the Jaccard similarity of the clauses.
+    Returns None for empty text.
+    """
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+    # (a·x + b) mod p for every permutation × shingle, min per permutation
+    permuted = (np.outer(_A, hashes) + _B[:, None]) % _PRIME
+    return permuted.min(axis=1)
+
+
+def meaning_key(text):
+    """
+    Numbers and negation words of a clause. Two clauses are only treated
+    as the same clause when their keys are equal.
+    """
+    text = _NUMBERING_RE.sub("", text or "").lower()
+    return (
+        tuple(sorted(_NUMBER_RE.findall(text))),
+        tuple(sorted(_NEGATION_RE.findall(text)))
+    )
+
+
+def similarity(sig_a, sig_b):
+    return float(np.mean(sig_a == sig_b))
+
+
+def lsh_bands(signature):
+    """
+    Yields (band, bucket) keys; clauses sharing any key are candidates.
+    """
+    for band in range(DEDUP_BANDS):
+        rows = signature[band * DEDUP_ROWS:(band + 1) * DEDUP_ROWS]
+        yield band, rows.tobytes()
+
+
+# =====================================================
+# DEDUPLICATOR
+# =====================================================
+class ClauseDeduplicator:
+    """
+    Collapses near-identical clauses (e.g. the same clause extracted from
+    two chunks) in roughly linear time: each clause is bucketed by LSH
+    bands of its MinHash signature and only compared against clauses that
+    share a bucket. Clauses whose numbers or negations differ are never
+    merged (see meaning_key).
+
+    The first occurrence is kept as the canonical clause. Every later
+    copy is recorded on it under "duplicate_ids" and kept in `copies`, so
+    expand_duplicates() can give each copy the canonical clause's result.
+    """
+
+    def __init__(self, threshold=DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self._buckets = {}
+        self._signatures = []
+        self._keys = []
+        self._canonical = []
+        self.duplicates = {}    # duplicate clause_id → canonical clause_id
+        self.copies = {}        # duplicate clause_id → dropped clause
+
+    def add(self, clause):
+        """
+        Returns True if the clause is new, False if it was folded into an
+        earlier clause.
+        """
+        signature = minhash_signature(clause.get("clause_text", ""))
+        if signature is None:
+            return True
+
+        meaning = meaning_key(clause.get("clause_text", ""))
+
+        candidates = set()
+        for key in lsh_bands(signature):
+            candidates.update(self._buckets.get(key, ()))
+
+        best, best_score = None, self.threshold
+        for idx in candidates:
+            if self._keys[idx] != meaning:
+                continue
+            score = similarity(signature, self._signatures[idx])
+            if score >= best_score:
+                best, best_score = idx, score
+
+        if best is not None:
+            canonical = self._canonical[best]
+            canonical.setdefault("duplicate_ids", []).append(clause.get("clause_id"))
+            self.duplicates[clause.get("clause_id")] = canonical.get("clause_id")
+            self.copies[clause.get("clause_id")] = clause
+            return False
+
+        idx = len(self._signatures)
+        self._signatures.append(signature)
+        self._keys.append(meaning)
+        self._canonical.append(clause)
+        for key in lsh_bands(signature):
+            self._buckets.setdefault(key, []).append(idx)
+        return True
+
+    def filter(self, clauses):
+        """
+        Yields only canonical clauses; works on lists and on streams.
+        """
+        for clause in clauses:
+            if self.add(clause):
+                yield clause
+
+
+def expand_duplicates(assessed_clauses, copies):
+    """
+    Re-inserts every dropped copy after its canonical clause, carrying a
+    copy of the canonical clause's risk, so each original clause_id gets
+    its own finding. Copies are marked with "duplicate_of".
+    """
+    expanded = []
+    for clause in assessed_clauses:
+        expanded.append(clause)
+        for dup_id in clause.get("duplicate_ids", []):
+            copy = dict(copies.get(dup_id) or {"clause_id": dup_id})
+            risk = clause.get("risk")
+            copy["risk"] = dict(risk) if isinstance(risk, dict) else risk
+            copy["duplicate_of"] = clause.get("clause_id")
+            expanded.append(copy)
+    return expanded
+
+
+def dedup_clauses(clauses, threshold=DEDUP_THRESHOLD):
+    """
+    clauses → list of clause dicts
+    Returns (unique_clauses, duplicates) where duplicates maps every
+    dropped clause_id to the clause_id it was merged into.
+    """
+    dedup = ClauseDeduplicator(threshold)
+    unique = list(dedup.filter(clauses))
+    return unique, dedup.duplicates
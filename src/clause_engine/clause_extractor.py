@@ -1,12 +1,28 @@
 # src/clause_engine/clause_extractor.py
 
+import os
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
-from src.llm.llm_router import chat_completion_json
+from src.llm.llm_router import chat_completion_json, stream_chat_completion, LLMStreamError
+from src.llm.json_stream import JSONArrayStreamParser
+from src.clause_engine.clause_segmenter import segment_clauses
 
 load_dotenv()
 
+# Chunks (or classification batches) extracted in parallel for large contracts
+EXTRACT_MAX_WORKERS = int(os.getenv("EXTRACT_MAX_WORKERS", "4"))
+
+# Max characters of clause text per classification call
+CLASSIFY_BATCH_CHARS = int(os.getenv("CLASSIFY_BATCH_CHARS", "20000"))
+
+CLAUSE_TYPES = [
+    "Confidentiality", "Termination", "Indemnity", "Liability", "Payment",
+    "Data Protection", "IP", "SLA", "Assignment", "Governing Law",
+    "Dispute Resolution", "Other"
+]
+
 # =====================================================
 # PROMPTS
 # =====================================================
@@ -34,16 +50,39 @@ Return ONLY a JSON array of objects with the exact schema described.
 DO NOT add commentary or text outside JSON.
 """
 
+CLASSIFY_SYSTEM_PROMPT = """
+You are a senior legal analyst AI.
+You are given contract clauses that have already been split out, each with a segment_id.
+Classify every clause. Do NOT repeat the clause text.
+
+Output MUST be a valid JSON array. Each object must contain:
+- segment_id (string, exactly as given)
+- clause_type (one of: {clause_types})
+- rationale (1 sentence why this classification is correct)
+""".format(clause_types=", ".join(CLAUSE_TYPES))
+
+CLASSIFY_USER_PROMPT = """
+Classify the following contract clauses:
+
+<CLAUSES>
+{segments}
+</CLAUSES>
+
+Return ONLY a JSON array with one object per segment_id.
+DO NOT add commentary or text outside JSON.
+"""
+
 # =====================================================
 # CORE FUNCTION (REFactored)
 # =====================================================
-def extract_clauses(contract_text: str):
+def extract_clauses(contract_text: str, use_cache=True):
     prompt = USER_PROMPT.format(contract=contract_text)
 
     response = chat_completion_json(
         system_prompt=SYSTEM_PROMPT,
         user_prompt=prompt,
-        temperature=0.0
+        temperature=0.0,
+        use_cache=use_cache
     )
 
     clauses = response["data"]
@@ -57,3 +96,160 @@ def extract_clauses(contract_text: str):
 
     return clauses
 
+
+# =====================================================
+# PARALLEL CHUNK EXTRACTION
+# =====================================================
+def extract_clauses_chunked(chunks, max_workers=EXTRACT_MAX_WORKERS, on_chunk_done=None):
+    """
+    Runs extract_clauses over every chunk on a bounded thread pool.
+    Clause ids are prefixed "chunk{idx}_" and results are merged in chunk
+    order regardless of completion order. on_chunk_done(done, total, idx)
+    is called from the calling thread, so it may touch UI state.
+    """
+    results = [None] * len(chunks)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract") as pool:
+        futures = {
+            pool.submit(extract_clauses, chunk): idx
+            for idx, chunk in enumerate(chunks)
+        }
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            idx = futures[future]
+            extracted = future.result()
+            for c in extracted:
+                c["clause_id"] = f"chunk{idx}_{c.get('clause_id', 'c')}"
+            results[idx] = extracted
+
+            print(f" - Processed chunk {idx + 1}/{len(chunks)} ({done} done)")
+            if on_chunk_done:
+                on_chunk_done(done, len(chunks), idx)
+
+    clauses = []
+    for extracted in results:
+        clauses.extend(extracted)
+    return clauses
+
+
+# =====================================================
+# SEGMENTED EXTRACTION (LLM CLASSIFIES ONLY)
+# =====================================================
+def extract_clauses_segmented(contract_text: str, max_workers=EXTRACT_MAX_WORKERS):
+    """
+    Splits numbered contracts locally (clause_segmenter) and asks the LLM
+    only for clause_type + rationale per segment, so clause text is never
+    re-generated as output tokens. Classification batches run on a
+    bounded thread pool and are merged in batch order. Returns None for
+    unnumbered contracts; callers then fall back to the full LLM
+    extraction.
+    """
+    segments = segment_clauses(contract_text)
+    if not segments:
+        return None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="classify") as pool:
+        futures = [pool.submit(_classify_batch, batch) for batch in _batch_segments(segments)]
+
+        labels = {}
+        for future in futures:
+            labels.update(future.result())
+
+    clauses = []
+    for seg in segments:
+        label = labels.get(seg["clause_id"], {})
+        clause_type = label.get("clause_type")
+
+        clauses.append({
+            "clause_id": seg["clause_id"],
+            "clause_heading": seg["clause_heading"],
+            "clause_text": seg["clause_text"],
+            "clause_type": clause_type if clause_type in CLAUSE_TYPES else "Other",
+            "rationale": label.get("rationale", "Not classified by LLM; defaulted to Other."),
+            "start": seg["start"],
+            "end": seg["end"],
+            "_llm_used": label.get("_llm_used", "none")
+        })
+
+    return clauses
+
+
+def _batch_segments(segments):
+    batch, size = [], 0
+    for seg in segments:
+        if batch and size + len(seg["clause_text"]) > CLASSIFY_BATCH_CHARS:
+            yield batch
+            batch, size = [], 0
+        batch.append(seg)
+        size += len(seg["clause_text"])
+    if batch:
+        yield batch
+
+
+def _classify_batch(batch):
+    payload = [
+        {
+            "segment_id": seg["clause_id"],
+            "heading": seg["clause_heading"],
+            "text": seg["clause_text"]
+        }
+        for seg in batch
+    ]
+
+    response = chat_completion_json(
+        system_prompt=CLASSIFY_SYSTEM_PROMPT,
+        user_prompt=CLASSIFY_USER_PROMPT.format(
+            segments=json.dumps(payload, ensure_ascii=False)
+        ),
+        temperature=0.0
+    )
+
+    labels = {}
+    for item in response.get("data", []):
+        if isinstance(item, dict) and item.get("segment_id") is not None:
+            item["_llm_used"] = response["_llm_used"]
+            labels[str(item["segment_id"])] = item
+
+    return labels
+
+
+# =====================================================
+# STREAMING EXTRACTION
+# =====================================================
+def extract_clauses_stream(contract_text: str):
+    """
+    Same prompt and output as extract_clauses, but yields each clause the
+    moment the LLM closes its JSON object, so risk assessment can start
+    while later clauses are still being generated.
+    """
+    prompt = USER_PROMPT.format(contract=contract_text)
+    parser = JSONArrayStreamParser()
+    seen_ids = set()
+    idx = 0
+
+    try:
+        for chunk in stream_chat_completion(
+            system_prompt=SYSTEM_PROMPT,
+            user_prompt=prompt,
+            temperature=0.0
+        ):
+            for clause in parser.feed(chunk["delta"]):
+                idx += 1
+                clause.setdefault("clause_id", str(idx))
+                clause["_llm_used"] = chunk["llm_used"]
+                seen_ids.add(str(clause["clause_id"]))
+                yield clause
+
+    except LLMStreamError as e:
+        print("⚠ Clause stream interrupted:", str(e))
+
+    if parser.complete:
+        return
+
+    # Stream broke off or never produced an array: finish with the
+    # blocking extractor, skipping clauses already handed downstream.
+    # Bypass the cache so a truncated streamed reply is not replayed.
+    print("⚠ Streaming extraction incomplete; falling back to full extraction")
+    for clause in extract_clauses(contract_text, use_cache=False):
+        if str(clause["clause_id"]) not in seen_ids:
+            yield clause
@@ -0,0 +1,137 @@
+# src/clause_engine/clause_segmenter.py
+
+import re
+
+# =====================================================
+# HEADING CONVENTION
+# =====================================================
+# Numbering convention for clause headings:
+# a line starting with "7", "7.", "7.2", "7.2.1" ... followed by whitespace
+HEADING_RE = re.compile(r"(?m)^(\d+(?:\.\d+)*)\.?[ \t]+(.*)$")
+
+# Fewer numbered headings than this → treat the contract as unnumbered
+MIN_SEGMENTS = 2
+
+# Section titles are short noun phrases ("DEFINITIONS", "Fees and Payment");
+# clause sentences end with punctuation or contain a verb
+TITLE_MAX_WORDS = 8
+_SENTENCE_END_RE = re.compile(r"[.;:!?,]\s*$")
+_VERB_RE = re.compile(
+    r"\b(?:shall|will|may|must|can|cannot|should|would|is|are|was|were|be|been|"
+    r"has|have|had|does|do|means|includes|agrees|applies|remains|requires|constitutes)\b",
+    re.IGNORECASE
+)
+
+
+def _is_title(line):
+    """
+    True when a heading line reads as a section title rather than a clause.
+    """
+    line = line.strip()
+    return (
+        bool(line)
+        and len(line.split()) <= TITLE_MAX_WORDS
+        and not _SENTENCE_END_RE.search(line)
+        and not _VERB_RE.search(line)
+    )
+
+
+def _parts(number):
+    return [int(p) for p in number.split(".")]
+
+
+def _follows(prev, current):
+    """
+    True when `current` is a plausible next heading after `prev`, e.g.
+    3 → 3.1, 3.1 → 3.2, 3.2 → 4, 3.2 → 4.1. Rejects wrapped lines that
+    merely start with a number ("30 days notice ...").
+    """
+    if prev is None:
+        return all(p <= 1 for p in current)
+
+    # First child of the previous heading: 3 → 3.1 / 3.1 → 3.1.1
+    if len(current) == len(prev) + 1 and current[:len(prev)] == prev:
+        return current[-1] in (0, 1)
+
+    # Increment at some level, optionally descending into first children
+    for depth in range(1, min(len(prev), len(current)) + 1):
+        if current[:depth - 1] == prev[:depth - 1] and current[depth - 1] == prev[depth - 1] + 1:
+            return all(p in (0, 1) for p in current[depth:])
+
+    return False
+
+
+# =====================================================
+# SEGMENTER
+# =====================================================
+def segment_clauses(text: str):
+    """
+    Splits normalize_text output on numbered headings.
+
+    Returns a list of segments:
+    - clause_id      ("7.2")
+    - clause_heading (title of the enclosing section, or None)
+    - clause_text    (exact text of the clause, numbering included)
+    - start, end     (character offsets of clause_text in `text`)
+
+    Section titles with no body of their own ("1. DEFINITIONS" directly
+    followed by "1.1 ...") are not clauses; they become the heading of
+    their children. Returns [] for contracts that are not numbered.
+    """
+    headings = []
+    prev = None
+
+    for m in HEADING_RE.finditer(text):
+        number = _parts(m.group(1))
+        if _follows(prev, number):
+            headings.append((m, number))
+            prev = number
+
+    if len(headings) < MIN_SEGMENTS:
+        return []
+
+    segments = []
+    titles = {}
+
+    for i, (m, number) in enumerate(headings):
+        start = m.start()
+        end = headings[i + 1][0].start() if i + 1 < len(headings) else len(text)
+        body = text[start:end].rstrip()
+        end = start + len(body)
+
+        first_line = m.group(2).strip()
+        is_title = _is_title(first_line)
+        has_more = bool(body[m.end() - start:].strip())
+
+        next_number = headings[i + 1][1] if i + 1 < len(headings) else None
+        opens_children = (
+            next_number is not None
+            and len(next_number) > len(number)
+            and next_number[:len(number)] == number
+        )
+
+        # Pure section title: remember it for the children. A one-line
+        # clause that opens sub-clauses ("5. Fees are payable monthly.")
+        # keeps its text
+        if opens_children and is_title and not has_more:
+            titles[tuple(number)] = first_line
+            continue
+
+        parent_title = None
+        for depth in range(len(number) - 1, 0, -1):
+            parent_title = titles.get(tuple(number[:depth]))
+            if parent_title:
+                break
+
+        if parent_title is None and is_title:
+            parent_title = first_line
+
+        segments.append({
+            "clause_id": m.group(1),
+            "clause_heading": parent_title,
+            "clause_text": body,
+            "start": start,
+            "end": end
+        })
+
+    return segments
@@ -0,0 +1,176 @@
+# src/contract_modification/amendment_cache.py
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+AMENDMENT_CACHE_PATH = Path(os.getenv("AMENDMENT_CACHE_PATH", "data/cache/amendment_cache.sqlite3"))
+
+# Set AMENDMENT_CACHE_DISABLED=1 to always generate fresh amendments
+AMENDMENT_CACHE_DISABLED = os.getenv("AMENDMENT_CACHE_DISABLED", "0").lower() in ("1", "true", "yes")
+
+AMENDMENT_CACHE_MAX_ENTRIES = int(os.getenv("AMENDMENT_CACHE_MAX_ENTRIES", "20000"))
+AMENDMENT_CACHE_MAX_AGE_DAYS = float(os.getenv("AMENDMENT_CACHE_MAX_AGE_DAYS", "90"))
+
+_lock = threading.Lock()
+_conn = None
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "writes": 0,
+    "evictions": 0
+}
+
+
+# =====================================================
+# KEYING
+# =====================================================
+def _canonical(value):
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(sorted(str(v) for v in value))
+    return re.sub(r"\s+", " ", str(value or "")).strip()
+
+
+def make_key(original_clause, reason, regulation, prompt):
+    """
+    Content hash of the amendment inputs. Whitespace and regulation list
+    order do not matter; the system prompt is included so a prompt change
+    never serves amendments written for the old one.
+    """
+    payload = json.dumps(
+        [_canonical(original_clause), _canonical(reason), _canonical(regulation), prompt],
+        ensure_ascii=False
+    ).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+# =====================================================
+# STORAGE
+# =====================================================
+def _get_conn():
+    global _conn
+
+    if _conn is None:
+        AMENDMENT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(AMENDMENT_CACHE_PATH), check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS amendment_cache (
+                key TEXT PRIMARY KEY,
+                amended_text TEXT NOT NULL,
+                llm_used TEXT,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        _conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_amendment_cache_last_access ON amendment_cache(last_access)"
+        )
+        _conn.commit()
+
+    return _conn
+
+
+def get(key):
+    """
+    Returns the cached amended text for key, or None on miss / expiry.
+    """
+    if AMENDMENT_CACHE_DISABLED:
+        return None
+
+    now = time.time()
+
+    with _lock:
+        conn = _get_conn()
+        row = conn.execute(
+            "SELECT amended_text, created_at FROM amendment_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > AMENDMENT_CACHE_MAX_AGE_DAYS * 86400:
+            _stats["misses"] += 1
+            return None
+
+        conn.execute("UPDATE amendment_cache SET last_access = ? WHERE key = ?", (now, key))
+        conn.commit()
+        _stats["hits"] += 1
+        return row[0]
+
+
+def put(key, amended_text, llm_used=None):
+    if AMENDMENT_CACHE_DISABLED or not amended_text:
+        return
+
+    now = time.time()
+
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO amendment_cache (key, amended_text, llm_used, created_at, last_access)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (key, amended_text, llm_used, now, now)
+        )
+        conn.commit()
+        _stats["writes"] += 1
+        _evict(conn, now)
+
+
+def clear():
+    with _lock:
+        conn = _get_conn()
+        conn.execute("DELETE FROM amendment_cache")
+        conn.commit()
+
+
+# =====================================================
+# EVICTION (AGE + LRU ENTRY CAP)
+# =====================================================
+def _evict(conn, now):
+    expired = conn.execute(
+        "DELETE FROM amendment_cache WHERE created_at < ?",
+        (now - AMENDMENT_CACHE_MAX_AGE_DAYS * 86400,)
+    ).rowcount
+
+    overflow = conn.execute("SELECT COUNT(*) FROM amendment_cache").fetchone()[0] - AMENDMENT_CACHE_MAX_ENTRIES
+    evicted = 0
+    if overflow > 0:
+        evicted = conn.execute(
+            """
+            DELETE FROM amendment_cache WHERE key IN (
+                SELECT key FROM amendment_cache ORDER BY last_access ASC LIMIT ?
+            )
+            """,
+            (overflow,)
+        ).rowcount
+
+    if expired or evicted:
+        conn.commit()
+        _stats["evictions"] += expired + evicted
+
+
+# =====================================================
+# STATS
+# =====================================================
+def amendment_cache_stats():
+    with _lock:
+        stats = dict(_stats)
+        entries = _get_conn().execute("SELECT COUNT(*) FROM amendment_cache").fetchone()[0]
+
+    lookups = stats["hits"] + stats["misses"]
+    stats["entries"] = entries
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["enabled"] = not AMENDMENT_CACHE_DISABLED
+    return stats
@@ -1,10 +1,16 @@
 # src/contract_modification/amendment_generator.py
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from src.llm.llm_router import chat_completion
+from src.contract_modification import amendment_cache
 
 load_dotenv()
 
+# High-risk clauses amended in parallel
+AMEND_MAX_WORKERS = int(os.getenv("AMEND_MAX_WORKERS", "4"))
+
 # =====================================================
 # PROMPTS
 # =====================================================
@@ -29,7 +35,25 @@ Draft a legally sound contract clause.
 # =====================================================
 # AMEND EXISTING CLAUSE (REFactored)
 # =====================================================
-def generate_amendment(original_clause, reason, regulation=None):
+def generate_amendment(original_clause, reason, regulation=None, force_regenerate=False):
+    return generate_amendment_tagged(original_clause, reason, regulation, force_regenerate)["text"]
+
+
+def generate_amendment_tagged(original_clause, reason, regulation=None, force_regenerate=False):
+    """
+    Same as generate_amendment, but returns {"text", "source"} where
+    source is "fresh" (generated now), "reused" (from the persistent
+    amendment cache) or "llm_cache" (a cached LLM response for the same
+    prompt). force_regenerate skips both the amendment cache
+    and the LLM response cache, and overwrites the cached amendment.
+    """
+    key = amendment_cache.make_key(original_clause, reason, regulation, SYSTEM_PROMPT_AMEND)
+
+    if not force_regenerate:
+        cached = amendment_cache.get(key)
+        if cached is not None:
+            return {"text": cached, "source": "reused"}
+
     user_prompt = f"""
 Original Clause:
 {original_clause}
@@ -44,13 +68,76 @@ Regulatory Context:
     result = chat_completion(
         system_prompt=SYSTEM_PROMPT_AMEND,
         user_prompt=user_prompt,
-        temperature=0.0
+        temperature=0.0,
+        use_cache=not force_regenerate
     )
 
     # Plain text expected (do NOT force JSON here)
     amended_clause = result["content"].strip()
 
-    return amended_clause
+    # Never cache the router's hard-fallback text
+    if result.get("llm_used") != "none":
+        amendment_cache.put(key, amended_clause, result.get("llm_used"))
+
+    return {"text": amended_clause, "source": "llm_cache" if result.get("cached") else "fresh"}
+
+
+# =====================================================
+# AMENDMENT QUEUE (FED WHILE RISK ANALYSIS RUNS)
+# =====================================================
+class AmendmentQueue:
+    """
+    Starts generate_amendment for a high-risk clause the moment it is
+    flagged, while other clauses are still being assessed. Amendments
+    run concurrently on a bounded pool; results() waits for the whole set.
+    """
+
+    def __init__(self, max_workers=AMEND_MAX_WORKERS, force_regenerate=False):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="amend")
+        self._jobs = {}     # clause_id → (clause, future), in submit order
+        self.force_regenerate = force_regenerate
+
+    def submit(self, clause):
+        """
+        Queues the clause if it passes the hard gate (severity exactly
+        "high" with a clear risk reason). Returns True if queued.
+        """
+        risk = clause.get("risk") or {}
+        cid = clause.get("clause_id")
+
+        # HARD GATE — rewrite ONLY true HIGH risk
+        if not isinstance(risk, dict) or risk.get("severity") != "high" or cid in self._jobs:
+            return False
+
+        risk_reason = risk.get("risk_reason") or risk.get("explanation")
+        if not risk_reason:
+            print(f"⚠️ Skipping clause {cid} — no clear risk reason")
+            return False
+
+        future = self._pool.submit(
+            generate_amendment_tagged,
+            original_clause=clause["clause_text"],
+            reason=risk_reason,
+            regulation=risk.get("regulation_violations", "General Compliance"),
+            force_regenerate=self.force_regenerate
+        )
+        self._jobs[cid] = (clause, future)
+        return True
+
+    def results(self):
+        """
+        Waits for every queued amendment and yields (clause, amendment)
+        in the order the clauses were queued; amendment is
+        {"text", "source"} as returned by generate_amendment_tagged.
+        """
+        try:
+            for clause, future in self._jobs.values():
+                yield clause, future.result()
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def __len__(self):
+        return len(self._jobs)
 
 
 # =====================================================
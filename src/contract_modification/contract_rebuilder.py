@@ -1,5 +1,7 @@
 # src/contract_modification/contract_rebuilder.py
 
+from src.clause_engine.clause_segmenter import segment_clauses
+
 def rebuild_contract(clauses, amendments, inserted_clauses=None):
     final_contract = []
 
@@ -22,3 +24,73 @@ def rebuild_contract(clauses, amendments, inserted_clauses=None):
     return "\n\n".join(final_contract)
 
 
+# =====================================================
+# OFFSET-BASED AMENDMENT SPLICING
+# =====================================================
+def build_span_index(text, clauses=None):
+    """
+    Maps clause_id → (start, end) character offsets in `text`, built once.
+    Numbered clauses come from clause_segmenter; clauses carrying their
+    own start/end (segmented extraction) or, failing that, text found
+    verbatim in the contract fill in ids the segmenter does not know
+    (e.g. chunk-prefixed ids from LLM extraction).
+    """
+    index = {
+        seg["clause_id"]: (seg["start"], seg["end"])
+        for seg in segment_clauses(text)
+    }
+
+    for c in clauses or []:
+        cid = c.get("clause_id")
+        if cid is None or cid in index:
+            continue
+
+        start, end = c.get("start"), c.get("end")
+        if isinstance(start, int) and isinstance(end, int) and 0 <= start < end <= len(text):
+            index[cid] = (start, end)
+            continue
+
+        body = (c.get("clause_text") or "").strip()
+        pos = text.find(body) if body else -1
+        if pos >= 0:
+            index[cid] = (pos, pos + len(body))
+
+    return index
+
+
+def splice_amendments(text, amendments, span_index):
+    """
+    Applies every amendment in one left-to-right pass over `text`.
+
+    Returns (updated_text, applied_ids, unmatched_ids). Ids with no span
+    are reported as unmatched, as are ids whose span overlaps one that
+    was already applied. Ids sharing exactly the same span (copies of one
+    clause extracted from overlapping chunks) are applied once together.
+    """
+    unmatched = [cid for cid in amendments if cid not in span_index]
+    edits = sorted(
+        (span_index[cid][0], span_index[cid][1], cid)
+        for cid in amendments if cid in span_index
+    )
+
+    parts, applied = [], []
+    cursor = 0
+    last_span = None
+
+    for start, end, cid in edits:
+        if (start, end) == last_span:
+            applied.append(cid)
+            continue
+
+        if start < cursor:
+            unmatched.append(cid)
+            continue
+
+        parts.append(text[cursor:start])
+        parts.append(amendments[cid].strip())
+        applied.append(cid)
+        cursor = end
+        last_span = (start, end)
+
+    parts.append(text[cursor:])
+    return "".join(parts), applied, unmatched
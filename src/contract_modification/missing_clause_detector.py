@@ -1,5 +1,24 @@
+import os
+import re
 import json
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
 from src.llm.llm_router import chat_completion_json
+from src.regulatory.regulation_sources import load_regulations, requirement_description
+from src.regulatory.regulation_tracker import local_coverage
+
+load_dotenv()
+
+# single    → one prompt with every clause and every regulation
+# mapreduce → one concurrent prompt per regulation with only relevant clauses
+MISSING_CLAUSE_MODE = os.getenv("MISSING_CLAUSE_MODE", "mapreduce").lower()
+
+MISSING_CLAUSE_MAX_WORKERS = int(os.getenv("MISSING_CLAUSE_MAX_WORKERS", "4"))
+
+# Per regulation: at most this many relevant clauses, each truncated
+MISSING_CLAUSE_TOP_K = int(os.getenv("MISSING_CLAUSE_TOP_K", "8"))
+MISSING_CLAUSE_MAX_CHARS = int(os.getenv("MISSING_CLAUSE_MAX_CHARS", "1500"))
 
 
 # =====================================================
@@ -57,7 +76,13 @@ Do NOT add explanations outside JSON.
 # =====================================================
 # CORE FUNCTION
 # =====================================================
-def detect_missing_clauses_from_contract(assessed_clauses, regulations):
+def detect_missing_clauses_from_contract(assessed_clauses, regulations, mode=None):
+    if (mode or MISSING_CLAUSE_MODE) == "mapreduce":
+        return detect_missing_clauses_mapreduce(assessed_clauses, regulations)
+    return _detect_missing_clauses_single(assessed_clauses, regulations)
+
+
+def _detect_missing_clauses_single(assessed_clauses, regulations):
     compact_clauses = []
     for clause in assessed_clauses:
         compact_clauses.append({
@@ -87,9 +112,148 @@ def detect_missing_clauses_from_contract(assessed_clauses, regulations):
     if isinstance(response, list):
         return response
 
-    # Fallback safety
-    try:
-        response = chat_completion_json(...)
-    except Exception:
-        return []
+    # An empty answer would read as "nothing missing"
+    raise RuntimeError(
+        f"Missing-clause detection returned no JSON array (llm: {response.get('_llm_used')})"
+    )
+
+
+# =====================================================
+# MAP-REDUCE MODE
+# =====================================================
+def _terms(text):
+    return set(re.findall(r"[a-z]+", (text or "").lower()))
+
+
+def _retrieval_terms(regulation, spec):
+    terms = set()
+    for name in spec.get("required_clauses", []):
+        terms |= _terms(requirement_description(name, regulation))
+    # Too generic to discriminate between clauses
+    return terms - {"data", "the", "and", "of"}
+
+
+def _relevant_clauses(assessed_clauses, regulation, spec):
+    """
+    Clauses that mention the regulation's required topics, best first,
+    capped at MISSING_CLAUSE_TOP_K and trimmed to the fields the model
+    needs. Prompt size therefore tracks relevance, not contract length.
+    """
+    terms = _retrieval_terms(regulation, spec)
+    scored = []
+
+    for idx, clause in enumerate(assessed_clauses):
+        words = _terms(clause.get("clause_heading")) | _terms(clause.get("clause_text"))
+        score = len(terms & words)
+        if score:
+            scored.append((-score, idx, clause))
+
+    scored.sort()
+    relevant = []
+    for _, _, clause in scored[:MISSING_CLAUSE_TOP_K]:
+        risk = clause.get("risk") if isinstance(clause.get("risk"), dict) else {}
+        relevant.append({
+            "clause_id": clause.get("clause_id"),
+            "clause_heading": clause.get("clause_heading"),
+            "clause_type": clause.get("clause_type"),
+            "clause_text": (clause.get("clause_text") or "")[:MISSING_CLAUSE_MAX_CHARS],
+            "risk_level": risk.get("risk_level"),
+            "explanation": risk.get("explanation")
+        })
+    return relevant
+
+
+def _map_regulation(name, spec, relevant):
+    # Nothing in the contract touches this regulation → no LLM call needed
+    if not relevant:
+        return [
+            {
+                "required_clause": required,
+                "regulation": name,
+                "reason": f"No clause in the contract addresses {required.lower()}."
+            }
+            for required in spec.get("required_clauses", [])
+        ]
+
+    prompt = USER_PROMPT.format(
+        regulations=json.dumps({name: spec}, ensure_ascii=False),
+        clauses=json.dumps(relevant, ensure_ascii=False)
+    )
+
+    response = chat_completion_json(
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt=prompt,
+        temperature=0.0
+    )
+
+    items = response.get("data") if isinstance(response, dict) else None
+    if not isinstance(items, list):
+        # Failed call: report every requirement sent rather than "nothing missing"
+        print(f"⚠ Missing-clause check for {name} returned no verdicts (llm: {response.get('_llm_used')})")
+        return [
+            {
+                "required_clause": required,
+                "regulation": name,
+                "reason": f"Coverage of {required.lower()} could not be confirmed.",
+                "unverified": True
+            }
+            for required in spec.get("required_clauses", [])
+        ]
+
+    results = []
+    for item in items:
+        if isinstance(item, dict) and item.get("required_clause"):
+            item["regulation"] = name
+            results.append(item)
+    return results
+
+
+def _unresolved_regulations(assessed_clauses, regulations):
+    """
+    Drops required clauses the local coverage scorer already finds
+    clearly covered, and regulations left with none, so the map step
+    only runs for what still needs the LLM.
+    """
+    covered = {
+        (r["regulation"], r["required_clause"])
+        for r in local_coverage(assessed_clauses, regulations)
+        if r["status"] == "covered"
+    }
+
+    unresolved = {}
+    for name, spec in regulations.items():
+        required = [c for c in spec.get("required_clauses", []) if (name, c) not in covered]
+        if required:
+            unresolved[name] = {**spec, "required_clauses": required}
+    return unresolved
+
+
+def detect_missing_clauses_mapreduce(assessed_clauses, regulations=None, max_workers=MISSING_CLAUSE_MAX_WORKERS):
+    """
+    Map: one concurrent call per regulation, with only the clauses
+    retrieved as relevant to its required clauses. Requirements the
+    local scorer finds clearly covered are left out beforehand.
+    Reduce: merge locally, one entry per (regulation, required_clause).
+    """
+    if regulations is None:
+        regulations = load_regulations()
+
+    regulations = _unresolved_regulations(assessed_clauses, regulations)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="missing") as pool:
+        futures = [
+            pool.submit(_map_regulation, name, spec, _relevant_clauses(assessed_clauses, name, spec))
+            for name, spec in regulations.items()
+        ]
+        mapped = [f.result() for f in futures]
+
+    merged, seen = [], set()
+    for results in mapped:
+        for item in results:
+            key = (item["regulation"], str(item["required_clause"]).strip().lower())
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+
+    return merged
 
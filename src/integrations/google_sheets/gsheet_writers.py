@@ -3,6 +3,24 @@
 from datetime import datetime
 from src.integrations.google_sheets.gsheet_client import get_spreadsheet
 
+# Sheets whose header row has been checked in this process
+_headers_checked = set()
+
+
+def _ensure_header(worksheet, column):
+    """
+    Appends a header cell to row 1 if the sheet was created before the
+    column existed, so new rows never land under an unlabeled column.
+    Checked once per sheet per process.
+    """
+    if worksheet.title in _headers_checked:
+        return
+
+    headers = worksheet.row_values(1)
+    if headers and column not in headers:
+        worksheet.update_cell(1, len(headers) + 1, column)
+    _headers_checked.add(worksheet.title)
+
 
 # =========================
 # Contracts Overview Writer
@@ -92,7 +110,8 @@ def write_action_audit(
     contract_id: str,
     target: str,
     status: str,
-    triggered_by: str = "System"
+    triggered_by: str = "System",
+    source: str = "-"
 ):
     """
     Logs actions performed by the system.
@@ -100,10 +119,12 @@ def write_action_audit(
     action_type: e.g. 'Clause Amended', 'Clause Inserted', 'Slack Alert Sent'
     target: clause_id, regulation, or '-' if not applicable
     status: Completed / Failed / Pending
+    source: 'fresh' / 'reused' / 'llm_cache' for amendments, '-' otherwise
     """
 
     spreadsheet = get_spreadsheet()
     worksheet = spreadsheet.worksheet("Actions_Audit")
+    _ensure_header(worksheet, "source")
 
     row = [
         datetime.utcnow().isoformat(),
@@ -111,7 +132,8 @@ def write_action_audit(
         action_type,
         target,
         status,
-        triggered_by
+        triggered_by,
+        source
     ]
 
     worksheet.append_row(row)
\ No newline at end of file
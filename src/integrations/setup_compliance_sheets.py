@@ -98,7 +98,8 @@ def initialize_compliance_sheets():
             "action_type",
             "target",
             "status",
-            "triggered_by"
+            "triggered_by",
+            "source"
         ]
     )
 
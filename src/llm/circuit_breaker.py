@@ -0,0 +1,301 @@
+# src/llm/circuit_breaker.py
+
+import os
+import time
+import threading
+from collections import deque
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+BREAKER_WINDOW_S = float(os.getenv("LLM_BREAKER_WINDOW_S", "60"))
+BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+BREAKER_CONSECUTIVE_FAILURES = int(os.getenv("LLM_BREAKER_CONSECUTIVE_FAILURES", "3"))
+
+# Calls slower than this count as "slow"; a mostly-slow window also trips
+BREAKER_SLOW_CALL_S = float(os.getenv("LLM_BREAKER_SLOW_CALL_S", "30"))
+BREAKER_SLOW_RATE = float(os.getenv("LLM_BREAKER_SLOW_RATE", "0.8"))
+
+# Open → half-open delay, doubled on every failed probe up to the max
+BREAKER_COOLDOWN_S = float(os.getenv("LLM_BREAKER_COOLDOWN_S", "30"))
+BREAKER_MAX_COOLDOWN_S = float(os.getenv("LLM_BREAKER_MAX_COOLDOWN_S", "300"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+# =====================================================
+# CIRCUIT BREAKER
+# =====================================================
+class CircuitBreaker:
+    def __init__(self, name):
+        self.name = name
+        self.state = CLOSED
+
+        self._events = deque()          # (timestamp, ok, latency_s)
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._cooldown = BREAKER_COOLDOWN_S
+        self._trial_in_flight = False
+        self._probe = None
+        self._probe_thread = None
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "trips": 0
+        }
+
+    # -------------------------
+    # Gate
+    # -------------------------
+    def allow(self):
+        """
+        True when a request may be sent to this provider now.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN:
+                # With a background probe registered, recovery is its job
+                cooled_down = time.monotonic() - self._opened_at >= self._cooldown
+                if self._probe is None and cooled_down:
+                    self.state = HALF_OPEN
+                    self._trial_in_flight = True
+                    return True
+
+                self._stats["rejected"] += 1
+                return False
+
+            # HALF_OPEN: let exactly one trial request through
+            if not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            self._stats["rejected"] += 1
+            return False
+
+    # -------------------------
+    # Outcomes
+    # -------------------------
+    def record_success(self, latency):
+        with self._lock:
+            self._stats["successes"] += 1
+            self._consecutive_failures = 0
+            self._push(True, latency)
+
+            if self.state == HALF_OPEN:
+                self._close()
+            elif self.state == CLOSED and self._window_tripped():
+                self._open()
+
+    def record_failure(self, latency=None):
+        with self._lock:
+            self._stats["failures"] += 1
+            self._consecutive_failures += 1
+            self._push(False, latency)
+
+            if self.state == HALF_OPEN:
+                self._open(backoff=True)
+            elif self.state == CLOSED and (
+                self._consecutive_failures >= BREAKER_CONSECUTIVE_FAILURES
+                or self._window_tripped()
+            ):
+                self._open()
+
+    def release(self):
+        """
+        Gives back a half-open trial slot when the request was never sent
+        (e.g. it failed over on rate-limit wait), so the next call can probe.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+
+    # -------------------------
+    # Rolling window
+    # -------------------------
+    def _push(self, ok, latency):
+        now = time.monotonic()
+        self._events.append((now, ok, latency))
+        self._prune(now)
+
+    def _prune(self, now):
+        while self._events and now - self._events[0][0] > BREAKER_WINDOW_S:
+            self._events.popleft()
+
+    def _window_rates(self):
+        total = len(self._events)
+        if not total:
+            return 0.0, 0.0
+
+        errors = sum(1 for _, ok, _ in self._events if not ok)
+        slow = sum(
+            1 for _, _, latency in self._events
+            if latency is not None and latency >= BREAKER_SLOW_CALL_S
+        )
+        return errors / total, slow / total
+
+    def _window_tripped(self):
+        if len(self._events) < BREAKER_MIN_CALLS:
+            return False
+        error_rate, slow_rate = self._window_rates()
+        return error_rate >= BREAKER_ERROR_RATE or slow_rate >= BREAKER_SLOW_RATE
+
+    def latency_percentile(self, q):
+        """
+        q-th percentile (0-100) of successful call latency in the window,
+        or None when there is no data yet.
+        """
+        with self._lock:
+            self._prune(time.monotonic())
+            latencies = sorted(
+                latency for _, ok, latency in self._events
+                if ok and latency is not None
+            )
+
+        return _percentile(latencies, q)
+
+    # -------------------------
+    # Transitions
+    # -------------------------
+    def _open(self, backoff=False):
+        if backoff:
+            self._cooldown = min(BREAKER_MAX_COOLDOWN_S, self._cooldown * 2)
+        if self.state != OPEN:
+            self._stats["trips"] += 1
+            print(f"⚠ Circuit OPEN for {self.name}; skipping it for {self._cooldown:.0f}s")
+
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+        self._start_probe()
+
+    def _close(self):
+        print(f"✅ Circuit CLOSED for {self.name}; provider healthy again")
+        self.state = CLOSED
+        self._opened_at = None
+        self._cooldown = BREAKER_COOLDOWN_S
+        self._trial_in_flight = False
+        self._consecutive_failures = 0
+        self._events.clear()
+
+    # -------------------------
+    # Background probing
+    # -------------------------
+    def set_probe(self, probe):
+        """
+        Registers a cheap health check (e.g. listing models). While the
+        circuit is open it runs in a daemon thread after each cooldown.
+        """
+        with self._lock:
+            self._probe = probe
+
+    def _start_probe(self):
+        if self._probe is None:
+            return
+        if self._probe_thread is not None and self._probe_thread.is_alive():
+            return
+
+        self._probe_thread = threading.Thread(
+            target=self._probe_loop,
+            name=f"breaker-probe-{self.name}",
+            daemon=True
+        )
+        self._probe_thread.start()
+
+    def _probe_loop(self):
+        while True:
+            with self._lock:
+                if self.state != OPEN:
+                    return
+                delay = max(0.0, self._opened_at + self._cooldown - time.monotonic())
+
+            time.sleep(delay)
+
+            with self._lock:
+                if self.state != OPEN:
+                    return
+                self.state = HALF_OPEN
+                self._trial_in_flight = True
+
+            started = time.monotonic()
+            try:
+                self._probe()
+            except Exception as e:
+                print(f"⚠ Health probe for {self.name} failed:", str(e))
+                self.record_failure(time.monotonic() - started)
+                continue
+
+            self.record_success(time.monotonic() - started)
+            return
+
+    # -------------------------
+    # Observability
+    # -------------------------
+    def snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            error_rate, slow_rate = self._window_rates()
+            latencies = sorted(
+                latency for _, ok, latency in self._events
+                if ok and latency is not None
+            )
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self._opened_at + self._cooldown - now), 2)
+
+            snapshot = dict(self._stats)
+            snapshot.update({
+                "provider": self.name,
+                "state": self.state,
+                "window_calls": len(self._events),
+                "error_rate": round(error_rate, 4),
+                "slow_call_rate": round(slow_rate, 4),
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in_s": retry_in
+            })
+
+        for q in (50, 95):
+            value = _percentile(latencies, q)
+            snapshot[f"latency_p{q}_s"] = round(value, 3) if value is not None else None
+
+        return snapshot
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+# =====================================================
+# PROCESS-WIDE REGISTRY
+# =====================================================
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(provider):
+    with _registry_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(provider)
+            _breakers[provider] = breaker
+        return breaker
+
+
+def breaker_states():
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -0,0 +1,109 @@
+# src/llm/hedging.py
+
+import os
+import threading
+from collections import deque, Counter
+from dotenv import load_dotenv
+
+from src.llm import circuit_breaker
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+# Set LLM_HEDGE_ENABLED=1 to hedge every call; callers can also pass hedge=True
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "0").lower() in ("1", "true", "yes")
+
+# Fire the backup once the primary is slower than this latency percentile
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+
+# Floor for the hedge delay, and the delay used before any latency is known
+LLM_HEDGE_MIN_DELAY_S = float(os.getenv("LLM_HEDGE_MIN_DELAY_S", "1.0"))
+LLM_HEDGE_DEFAULT_DELAY_S = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_S", "5.0"))
+
+LLM_HEDGE_WORKERS = int(os.getenv("LLM_HEDGE_WORKERS", "16"))
+
+
+# =====================================================
+# DEADLINE
+# =====================================================
+def hedge_delay(provider):
+    """
+    Seconds to wait on the primary before hedging, taken from the
+    provider's recent latency distribution.
+    """
+    observed = circuit_breaker.get_breaker(provider).latency_percentile(LLM_HEDGE_PERCENTILE)
+    if observed is None:
+        return LLM_HEDGE_DEFAULT_DELAY_S
+    return max(LLM_HEDGE_MIN_DELAY_S, observed)
+
+
+def is_enabled(hedge=None):
+    return LLM_HEDGE_ENABLED if hedge is None else bool(hedge)
+
+
+# =====================================================
+# PER-CALL STATS
+# =====================================================
+_lock = threading.Lock()
+_recent = deque(maxlen=200)
+_totals = Counter()
+
+
+def new_record(primary, secondary, delay):
+    return {
+        "primary": primary,
+        "secondary": secondary,
+        "hedge_delay_s": round(delay, 3),
+        "hedged": False,
+        "winner": None,
+        "latency_s": None,
+        # Filled in once the losing request's outcome is known
+        "saved_s": None
+    }
+
+
+def finish_record(record, winner, latency):
+    record["winner"] = winner
+    record["latency_s"] = round(latency, 3) if latency is not None else None
+
+    with _lock:
+        _recent.append(record)
+        _totals["calls"] += 1
+        if record["hedged"]:
+            _totals["hedged"] += 1
+        if winner:
+            _totals[f"won_by:{winner}"] += 1
+
+
+def record_saving(record, saved):
+    """
+    saved = how much later the losing primary would have answered than
+    the winning secondary did (0 when the primary won anyway).
+    """
+    record["saved_s"] = round(max(0.0, saved), 3)
+
+    with _lock:
+        _totals["saved_ms"] += int(record["saved_s"] * 1000)
+        _totals["measured"] += 1
+
+
+def hedge_stats():
+    with _lock:
+        totals = dict(_totals)
+        recent = [dict(r) for r in _recent]
+
+    return {
+        "enabled": LLM_HEDGE_ENABLED,
+        "percentile": LLM_HEDGE_PERCENTILE,
+        "calls": totals.get("calls", 0),
+        "hedged": totals.get("hedged", 0),
+        "wins": {
+            key.split(":", 1)[1]: value
+            for key, value in totals.items() if key.startswith("won_by:")
+        },
+        "total_saved_s": round(totals.get("saved_ms", 0) / 1000, 3),
+        "savings_measured": totals.get("measured", 0),
+        "recent": recent[-20:]
+    }
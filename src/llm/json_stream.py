@@ -0,0 +1,74 @@
+# src/llm/json_stream.py
+
+import json
+
+
+# =====================================================
+# INCREMENTAL JSON ARRAY PARSER
+# =====================================================
+class JSONArrayStreamParser:
+    """
+    Consumes an LLM reply chunk by chunk and returns each top-level
+    object of the JSON array as soon as its closing brace arrives.
+    Text before the opening '[' (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._element = None    # chars of the element being read
+        self.complete = False
+        self.errors = 0
+
+    def feed(self, text):
+        objects = []
+
+        for ch in text:
+            if self.complete:
+                break
+
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._element is not None:
+                self._element.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 1 and ch == "{":
+                    self._element = [ch]
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and ch == "}" and self._element is not None:
+                    obj = self._decode("".join(self._element))
+                    if obj is not None:
+                        objects.append(obj)
+                    self._element = None
+                elif self._depth == 0:
+                    self.complete = True
+
+        return objects
+
+    def _decode(self, raw):
+        try:
+            obj = json.loads(raw)
+        except json.JSONDecodeError:
+            self.errors += 1
+            return None
+        return obj if isinstance(obj, dict) else None
@@ -0,0 +1,220 @@
+# src/llm/llm_cache.py
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", "data/cache/llm_cache.sqlite3"))
+
+# Set LLM_CACHE_DISABLED=1 to bypass the cache for every call
+LLM_CACHE_DISABLED = os.getenv("LLM_CACHE_DISABLED", "0").lower() in ("1", "true", "yes")
+
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "256"))
+LLM_CACHE_MAX_AGE_DAYS = float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", "30"))
+
+# Only deterministic-ish calls are worth reusing
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.0"))
+
+_lock = threading.Lock()
+_conn = None
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "writes": 0,
+    "evictions": 0
+}
+
+
+# =====================================================
+# KEYING
+# =====================================================
+def make_key(provider, model, system_prompt, user_prompt, temperature):
+    payload = json.dumps(
+        [provider, model, system_prompt, user_prompt, round(float(temperature), 4)],
+        ensure_ascii=False
+    ).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def is_cacheable(temperature, use_cache=True):
+    if LLM_CACHE_DISABLED or not use_cache:
+        return False
+    return float(temperature) <= LLM_CACHE_MAX_TEMPERATURE
+
+
+# =====================================================
+# STORAGE
+# =====================================================
+def _get_conn():
+    global _conn
+
+    if _conn is None:
+        LLM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(LLM_CACHE_PATH), check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        _conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)"
+        )
+        _conn.commit()
+
+    return _conn
+
+
+def get(key):
+    """
+    Returns the cached content for key, or None on miss / expiry.
+    """
+    hit = get_first([key])
+    return hit[1] if hit else None
+
+
+def get_first(keys, max_ages=None):
+    """
+    Looks keys up in order and returns (key, content) for the first
+    live entry, or None. Counts as a single hit or miss.
+
+    max_ages optionally gives a shorter lifetime in seconds per key
+    (None → the global LLM_CACHE_MAX_AGE_DAYS).
+    """
+    now = time.time()
+    default_max_age = LLM_CACHE_MAX_AGE_DAYS * 86400
+
+    with _lock:
+        conn = _get_conn()
+
+        for i, key in enumerate(keys):
+            max_age = default_max_age
+            if max_ages is not None and max_ages[i] is not None:
+                max_age = min(default_max_age, max_ages[i])
+
+            row = conn.execute(
+                "SELECT content, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                continue
+
+            content, created_at = row
+
+            if now - created_at > max_age:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                _stats["evictions"] += 1
+                continue
+
+            conn.execute(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            conn.commit()
+            _stats["hits"] += 1
+            return key, content
+
+        _stats["misses"] += 1
+        return None
+
+
+def put(key, provider, model, content):
+    now = time.time()
+    size = len(content.encode("utf-8"))
+
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO llm_cache
+                (key, provider, model, content, size, created_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (key, provider, model, content, size, now, now)
+        )
+        conn.commit()
+        _stats["writes"] += 1
+        _evict(conn, now)
+
+
+def invalidate(key):
+    with _lock:
+        conn = _get_conn()
+        conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+        conn.commit()
+
+
+def clear():
+    with _lock:
+        conn = _get_conn()
+        conn.execute("DELETE FROM llm_cache")
+        conn.commit()
+
+
+# =====================================================
+# EVICTION (AGE + LRU SIZE CAP)
+# =====================================================
+def _evict(conn, now):
+    cutoff = now - LLM_CACHE_MAX_AGE_DAYS * 86400
+    expired = conn.execute(
+        "DELETE FROM llm_cache WHERE created_at < ?", (cutoff,)
+    ).rowcount
+
+    max_bytes = int(LLM_CACHE_MAX_MB * 1024 * 1024)
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    evicted = 0
+    if total > max_bytes:
+        rows = conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_access ASC"
+        ).fetchall()
+
+        stale_keys = []
+        for key, size in rows:
+            if total <= max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale_keys)
+        evicted = len(stale_keys)
+
+    if expired or evicted:
+        conn.commit()
+        _stats["evictions"] += expired + evicted
+
+
+# =====================================================
+# STATS
+# =====================================================
+def cache_stats():
+    with _lock:
+        stats = dict(_stats)
+        conn = _get_conn()
+        entries, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+
+    lookups = stats["hits"] + stats["misses"]
+    stats["entries"] = entries
+    stats["size_bytes"] = total
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["enabled"] = not LLM_CACHE_DISABLED
+    return stats
@@ -0,0 +1,174 @@
+# src/llm/llm_cassette.py
+
+import os
+import json
+import random
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+from collections import defaultdict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+# off    → normal routing
+# record → call providers as usual and append every exchange to the cassette
+# replay → never touch the network; answer from the cassette
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+LLM_CASSETTE_PATH = Path(os.getenv("LLM_CASSETTE_PATH", "data/cassettes/llm_cassette.jsonl"))
+
+# Replay latency model:
+#   recorded              → sleep for the latency observed while recording
+#   none                  → answer instantly
+#   fixed:<s>             → constant latency
+#   uniform:<lo>,<hi>     → uniform between lo and hi seconds
+#   lognormal:<median>,<sigma>
+LLM_REPLAY_LATENCY = os.getenv("LLM_REPLAY_LATENCY", "recorded")
+LLM_REPLAY_LATENCY_SCALE = float(os.getenv("LLM_REPLAY_LATENCY_SCALE", "1.0"))
+LLM_REPLAY_SEED = int(os.getenv("LLM_REPLAY_SEED", "0"))
+
+_lock = threading.Lock()
+_tape = None                        # key → [entries] in recorded order
+_cursor = defaultdict(int)          # key → next entry to serve
+_stats = {"recorded": 0, "replayed": 0, "misses": 0}
+
+
+def is_recording():
+    return LLM_CASSETTE_MODE == "record"
+
+
+def is_replaying():
+    return LLM_CASSETTE_MODE == "replay"
+
+
+def make_key(system_prompt, user_prompt, temperature):
+    # Provider-independent: replay must not depend on which provider answered
+    payload = json.dumps(
+        [system_prompt, user_prompt, round(float(temperature), 4)],
+        ensure_ascii=False
+    ).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+# =====================================================
+# RECORD
+# =====================================================
+def record(system_prompt, user_prompt, temperature, result, latency):
+    entry = {
+        "key": make_key(system_prompt, user_prompt, temperature),
+        "system_prompt": system_prompt,
+        "user_prompt": user_prompt,
+        "temperature": temperature,
+        "llm_used": result["llm_used"],
+        "content": result["content"],
+        "latency_s": round(latency, 4),
+        "recorded_at": datetime.utcnow().isoformat()
+    }
+
+    with _lock:
+        LLM_CASSETTE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(LLM_CASSETTE_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        _stats["recorded"] += 1
+
+
+# =====================================================
+# REPLAY
+# =====================================================
+def _load_tape():
+    global _tape
+
+    if _tape is not None:
+        return _tape
+
+    _tape = defaultdict(list)
+    if not LLM_CASSETTE_PATH.exists():
+        print(f"⚠ Cassette not found: {LLM_CASSETTE_PATH}")
+        return _tape
+
+    with open(LLM_CASSETTE_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                _tape[entry["key"]].append(entry)
+
+    return _tape
+
+
+def replay(system_prompt, user_prompt, temperature):
+    """
+    Returns (result, simulated_latency) for the next recorded answer to
+    this prompt, or (None, 0) on a miss. Repeated prompts are served in
+    recorded order and wrap around.
+    """
+    key = make_key(system_prompt, user_prompt, temperature)
+
+    with _lock:
+        entries = _load_tape().get(key)
+        if not entries:
+            _stats["misses"] += 1
+            return None, 0.0
+
+        cursor = _cursor[key]
+        entry = entries[cursor % len(entries)]
+        _cursor[key] += 1
+        _stats["replayed"] += 1
+
+    latency = _simulated_latency(entry, key, cursor)
+
+    result = {
+        "llm_used": entry["llm_used"],
+        "content": entry["content"],
+        "replayed": True
+    }
+    return result, latency
+
+
+def _call_rng(key, cursor):
+    # One generator per (seed, prompt, occurrence): draws do not depend on
+    # the order in which concurrent workers reach the cassette
+    seed = hashlib.sha256(f"{LLM_REPLAY_SEED}:{key}:{cursor}".encode("utf-8")).digest()
+    return random.Random(int.from_bytes(seed[:8], "big"))
+
+
+def _simulated_latency(entry, key, cursor):
+    model, _, params = LLM_REPLAY_LATENCY.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()]
+
+    if model == "none":
+        latency = 0.0
+    elif model == "fixed":
+        latency = values[0]
+    elif model == "uniform":
+        latency = _call_rng(key, cursor).uniform(values[0], values[1])
+    elif model == "lognormal":
+        median, sigma = values
+        latency = _call_rng(key, cursor).lognormvariate(0.0, sigma) * median
+    else:
+        latency = entry.get("latency_s", 0.0)
+
+    return max(0.0, latency * LLM_REPLAY_LATENCY_SCALE)
+
+
+def reset():
+    """
+    Rewinds every prompt to its first recording, so consecutive benchmark
+    runs see identical answers and latencies.
+    """
+    global _tape
+    with _lock:
+        _tape = None
+        _cursor.clear()
+
+
+def cassette_stats():
+    with _lock:
+        stats = dict(_stats)
+    stats["mode"] = LLM_CASSETTE_MODE
+    stats["path"] = str(LLM_CASSETTE_PATH)
+    return stats
@@ -2,14 +2,29 @@ import os
 import json
 import time
 import re
+import asyncio
+import inspect
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 
 # -------------------------
 # Groq
 # -------------------------
-from groq import Groq
+from groq import Groq, AsyncGroq
 from groq import RateLimitError as GroqRateLimitError
-from openai import OpenAI
+from groq import DefaultAsyncHttpxClient as GroqAsyncHttpxClient
+from openai import OpenAI, AsyncOpenAI
+from openai import RateLimitError as OpenAIRateLimitError
+from openai import DefaultAsyncHttpxClient as OpenAIAsyncHttpxClient
+import httpx
+
+from src.llm import llm_cache
+from src.llm import rate_limiter
+from src.llm import circuit_breaker
+from src.llm import hedging
+from src.llm import llm_cassette
 
 # -------------------------
 # Gemini
@@ -33,6 +48,29 @@ GROQ_MODEL = os.getenv(
 )
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+OPENROUTER_MODEL = "meta-llama/llama-3.1-8b-instruct"
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Async router: in-flight requests allowed per provider
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "8"))
+OPENROUTER_MAX_CONCURRENCY = int(os.getenv("OPENROUTER_MAX_CONCURRENCY", "4"))
+
+# Rate-limit retries before a provider is given up on for this call
+LLM_RATE_MAX_RETRIES = int(os.getenv("LLM_RATE_MAX_RETRIES", "3"))
+
+# Async router: keep-alive connection pool per provider
+LLM_POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "32"))
+LLM_POOL_KEEPALIVE = int(os.getenv("LLM_POOL_KEEPALIVE", "16"))
+
+# Provider preference order, used for cache lookups
+PROVIDER_ORDER = [
+    ("groq", GROQ_MODEL),
+    ("openrouter-llama", OPENROUTER_MODEL)
+]
+
+# Answers from the degraded fallback model are only reused briefly, so a
+# primary outage does not pin the weaker answer for the whole cache TTL
+LLM_CACHE_FALLBACK_TTL = float(os.getenv("LLM_CACHE_FALLBACK_TTL", "3600"))
 
 # =====================================================
 # CLIENTS
@@ -56,88 +94,502 @@ else:
 try:
     openrouter_client = OpenAI(
         api_key=OPENROUTER_API_KEY,
-        base_url="https://openrouter.ai/api/v1"
+        base_url=OPENROUTER_BASE_URL
     )
 except Exception:
     openrouter_client = None
 
+
+# Background health probes for open circuits (listing models costs no tokens)
+def _probe_groq():
+    groq_client.models.list()
+
+
+def _probe_openrouter():
+    openrouter_client.models.list()
+
+
+circuit_breaker.get_breaker("groq").set_probe(_probe_groq)
+circuit_breaker.get_breaker("openrouter-llama").set_probe(_probe_openrouter)
+
+# =====================================================
+# RESPONSE CACHE
+# =====================================================
+def _cacheable(temperature, use_cache):
+    # Record / replay runs must see every call, so they skip the cache
+    if llm_cassette.is_recording() or llm_cassette.is_replaying():
+        return False
+    return llm_cache.is_cacheable(temperature, use_cache)
+
+
+def _cache_lookup(system_prompt, user_prompt, temperature):
+    keys = {
+        llm_cache.make_key(provider, model, system_prompt, user_prompt, temperature): provider
+        for provider, model in PROVIDER_ORDER
+    }
+
+    primary = PROVIDER_ORDER[0][0]
+    max_ages = [None if provider == primary else LLM_CACHE_FALLBACK_TTL for provider in keys.values()]
+
+    hit = llm_cache.get_first(list(keys), max_ages)
+    if hit is None:
+        return None
+
+    key, content = hit
+    return {
+        "llm_used": keys[key],
+        "content": content,
+        "cached": True
+    }
+
+
+def _cache_store(result, system_prompt, user_prompt, temperature):
+    for provider, model in PROVIDER_ORDER:
+        if provider == result["llm_used"]:
+            key = llm_cache.make_key(provider, model, system_prompt, user_prompt, temperature)
+            llm_cache.put(key, provider, model, result["content"])
+            return
+
+
+def _cache_invalidate(result, system_prompt, user_prompt, temperature):
+    for provider, model in PROVIDER_ORDER:
+        if provider == result["llm_used"]:
+            key = llm_cache.make_key(provider, model, system_prompt, user_prompt, temperature)
+            llm_cache.invalidate(key)
+            return
+
+
+# =====================================================
+# RECORD / REPLAY PROVIDER
+# =====================================================
+# LLM_CASSETTE_MODE=record appends every exchange (with its latency) to
+# the cassette; LLM_CASSETTE_MODE=replay answers from it with no network.
+REPLAY_STREAM_CHUNKS = 20
+
+
+def _replay(system_prompt, user_prompt, temperature):
+    result, latency = llm_cassette.replay(system_prompt, user_prompt, temperature)
+    if result is None:
+        print("⚠ Cassette miss; prompt was never recorded. Using hard fallback")
+        return _hard_fallback()
+
+    time.sleep(latency)
+    return result
+
+
+async def _areplay(system_prompt, user_prompt, temperature):
+    result, latency = llm_cassette.replay(system_prompt, user_prompt, temperature)
+    if result is None:
+        print("⚠ Cassette miss; prompt was never recorded. Using hard fallback")
+        return _hard_fallback()
+
+    await asyncio.sleep(latency)
+    return result
+
+
+def _replay_stream(system_prompt, user_prompt, temperature):
+    result, latency = llm_cassette.replay(system_prompt, user_prompt, temperature)
+    if result is None:
+        print("⚠ Cassette miss; prompt was never recorded. Using hard fallback")
+        result = _hard_fallback()
+
+    # Spread the simulated latency evenly over the streamed pieces
+    content = result["content"]
+    step = max(1, -(-len(content) // REPLAY_STREAM_CHUNKS))
+    pieces = [content[i:i + step] for i in range(0, len(content), step)] or [""]
+
+    for piece in pieces:
+        time.sleep(latency / len(pieces))
+        yield {"llm_used": result["llm_used"], "delta": piece}
+
+
+# =====================================================
+# SHARED HELPERS
+# =====================================================
+def _messages(system_prompt, user_prompt):
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _hard_fallback():
+    return {
+        "llm_used": "none",
+        "content": json.dumps({
+            "risk_level": "UNKNOWN",
+            "explanation": "LLM unavailable. Manual compliance review required.",
+            "regulation": "N/A"
+        })
+    }
+
+
 # =====================================================
 # CORE ROUTER
 # =====================================================
-def chat_completion(system_prompt, user_prompt, temperature=0.2):
+def chat_completion(system_prompt, user_prompt, temperature=0.2, use_cache=True, hedge=None):
+    if llm_cassette.is_replaying():
+        return _replay(system_prompt, user_prompt, temperature)
+
+    cacheable = _cacheable(temperature, use_cache)
+
+    if cacheable:
+        cached = _cache_lookup(system_prompt, user_prompt, temperature)
+        if cached is not None:
+            return cached
+
+    started = time.monotonic()
+    if hedging.is_enabled(hedge):
+        result = _route_hedged(system_prompt, user_prompt, temperature)
+    else:
+        result = _route_completion(system_prompt, user_prompt, temperature)
+
+    if llm_cassette.is_recording():
+        llm_cassette.record(
+            system_prompt, user_prompt, temperature, result, time.monotonic() - started
+        )
+
+    # Never persist the hard fallback
+    if cacheable and result["llm_used"] != "none":
+        _cache_store(result, system_prompt, user_prompt, temperature)
+
+    return result
+
+
+def _route_completion(system_prompt, user_prompt, temperature):
     # -------------------------
-    # 1. Try Groq (PRIMARY)
+    # 1. Groq (PRIMARY), 2. OpenRouter Fallback (FREE LLaMA)
     # -------------------------
-    if groq_client is not None:
-        try:
-            response = groq_client.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=temperature
-            )
+    for provider, client, model in _sync_providers():
+        if client is None:
+            print(f"⚠ {provider} client not available; skipping")
+            continue
+
+        if not circuit_breaker.get_breaker(provider).allow():
+            print(f"⚠ {provider} circuit open; skipping")
+            continue
 
+        content = _try_provider(provider, client, model, system_prompt, user_prompt, temperature)
+        if content is not None:
             return {
-                "llm_used": "groq",
-                "content": response.choices[0].message.content
+                "llm_used": provider,
+                "content": content
             }
 
-        except GroqRateLimitError:
-            print("⚠ Groq rate limit hit. Falling back to Gemini...")
-            time.sleep(1)
+    # -------------------------
+    # 3. HARD FALLBACK (NEVER CRASH)
+    # -------------------------
+    return _hard_fallback()
+
 
-        except Exception as e:
-            print("⚠ Groq error:", str(e))
-    else:
-        # Safe notice when Groq client is unavailable
-        print("⚠ Groq client not available; skipping Groq and attempting Gemini fallback")
+def _sync_providers():
+    return [
+        ("groq", groq_client, GROQ_MODEL),
+        ("openrouter-llama", openrouter_client, OPENROUTER_MODEL)
+    ]
 
 
-    # -------------------------
-    # 2. OpenRouter Fallback (FREE LLaMA)
-    # -------------------------
-    if openrouter_client is not None:
+def _try_provider(provider, client, model, system_prompt, user_prompt, temperature, on_sent=None):
+    """
+    Calls one provider through its rate limiter and circuit breaker.
+    Returns the reply text, or None when the provider failed or the
+    queue wait is too long. on_sent() fires once the rate-limit slot is
+    held and the request is about to go out.
+    """
+    limiter = rate_limiter.get_limiter(provider)
+    breaker = circuit_breaker.get_breaker(provider)
+
+    for _ in range(LLM_RATE_MAX_RETRIES + 1):
+        if not limiter.acquire():
+            print(f"⚠ {provider} queue wait exceeds {rate_limiter.LLM_RATE_MAX_WAIT}s; failing over")
+            breaker.release()
+            return None
+
+        if on_sent:
+            on_sent()
+        started = time.monotonic()
         try:
-            response = openrouter_client.chat.completions.create(
-                model="meta-llama/llama-3.1-8b-instruct",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+            raw = client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=_messages(system_prompt, user_prompt),
                 temperature=temperature
             )
+            limiter.on_success(raw.headers)
+            content = raw.parse().choices[0].message.content
+            breaker.record_success(time.monotonic() - started)
+            return content
+
+        except (GroqRateLimitError, OpenAIRateLimitError) as e:
+            # Throttling is the limiter's concern, not a health failure
+            print(f"⚠ {provider} rate limit hit; waiting for capacity")
+            limiter.on_rate_limited(_error_headers(e))
+
+        except Exception as e:
+            print(f"⚠ {provider} error:", str(e))
+            breaker.record_failure(time.monotonic() - started)
+            return None
+
+    print(f"⚠ {provider} still rate limited after {LLM_RATE_MAX_RETRIES} retries; failing over")
+    breaker.release()
+    return None
+
+
+def _error_headers(error):
+    response = getattr(error, "response", None)
+    return getattr(response, "headers", None)
+
+
+# =====================================================
+# HEDGED ROUTER
+# =====================================================
+_hedge_pool = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _get_hedge_pool():
+    global _hedge_pool
+    with _hedge_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(
+                max_workers=hedging.LLM_HEDGE_WORKERS,
+                thread_name_prefix="llm-hedge"
+            )
+        return _hedge_pool
+
+
+def _timed_try(provider, client, model, system_prompt, user_prompt, temperature, on_sent=None):
+    content = _try_provider(provider, client, model, system_prompt, user_prompt, temperature, on_sent)
+    return content, time.monotonic()
+
 
+def _route_hedged(system_prompt, user_prompt, temperature):
+    """
+    Sends the call to the primary provider and, if it has not answered
+    within its latency-percentile deadline, races the secondary against
+    it. Threads cannot be interrupted, so the losing request is abandoned
+    and only observed to measure how much time the hedge saved.
+    """
+    providers = [p for p in _sync_providers() if p[1] is not None]
+    if len(providers) < 2 or not circuit_breaker.get_breaker(providers[0][0]).allow():
+        return _route_completion(system_prompt, user_prompt, temperature)
+
+    (primary, p_client, p_model), (secondary, s_client, s_model) = providers[:2]
+    args = (system_prompt, user_prompt, temperature)
+
+    delay = hedging.hedge_delay(primary)
+    record = hedging.new_record(primary, secondary, delay)
+    pool = _get_hedge_pool()
+    started = time.monotonic()
+
+    # The hedge deadline runs from when the primary request is sent, not
+    # from submission: time queued in the local rate limiter is not slowness
+    sent = threading.Event()
+    primary_future = pool.submit(_timed_try, primary, p_client, p_model, *args, sent.set)
+    primary_future.add_done_callback(lambda f: sent.set())
+    futures = {primary_future: primary}
+
+    sent.wait()
+    done, _ = wait(futures, timeout=delay)
+
+    if not done and circuit_breaker.get_breaker(secondary).allow():
+        print(f"⏱ {primary} slower than {delay:.1f}s; hedging with {secondary}")
+        record["hedged"] = True
+        futures[pool.submit(_timed_try, secondary, s_client, s_model, *args)] = secondary
+
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            content, finished_at = future.result()
+            if content is None:
+                continue
+
+            winner = futures[future]
+            hedging.finish_record(record, winner, finished_at - started)
+
+            if record["hedged"] and winner == primary:
+                hedging.record_saving(record, 0.0)
+            for loser in pending:
+                loser.add_done_callback(
+                    lambda f, won_at=finished_at: _measure_hedge_saving(record, f, won_at)
+                )
+
+            return {
+                "llm_used": winner,
+                "content": content,
+                "hedge": record
+            }
+
+    # Primary failed before the deadline: ordinary failover
+    if not record["hedged"] and circuit_breaker.get_breaker(secondary).allow():
+        content = _try_provider(secondary, s_client, s_model, *args)
+        if content is not None:
+            hedging.finish_record(record, secondary, time.monotonic() - started)
             return {
-                "llm_used": "openrouter-llama",
-                "content": response.choices[0].message.content
+                "llm_used": secondary,
+                "content": content,
+                "hedge": record
             }
 
+    hedging.finish_record(record, None, time.monotonic() - started)
+    return _hard_fallback()
+
+
+def _measure_hedge_saving(record, future, won_at):
+    try:
+        content, finished_at = future.result()
+    except Exception:
+        return
+    if content is not None:
+        hedging.record_saving(record, finished_at - won_at)
+
+
+# =====================================================
+# STREAMING ROUTER
+# =====================================================
+class LLMStreamError(Exception):
+    """
+    Raised when a provider fails after part of its reply was streamed,
+    so the caller can discard or salvage the partial output.
+    """
+
+
+def stream_chat_completion(system_prompt, user_prompt, temperature=0.2, use_cache=True):
+    """
+    Yields {"llm_used", "delta"} chunks as the provider streams tokens.
+    Same provider order, limiter, breaker and cache as chat_completion;
+    a provider that fails before its first token is failed over silently.
+    """
+    if llm_cassette.is_replaying():
+        yield from _replay_stream(system_prompt, user_prompt, temperature)
+        return
+
+    if not llm_cassette.is_recording():
+        yield from _route_stream(system_prompt, user_prompt, temperature, use_cache)
+        return
+
+    started = time.monotonic()
+    parts = []
+    llm_used = "none"
+    for chunk in _route_stream(system_prompt, user_prompt, temperature, use_cache):
+        parts.append(chunk["delta"])
+        llm_used = chunk["llm_used"]
+        yield chunk
+
+    llm_cassette.record(
+        system_prompt, user_prompt, temperature,
+        {"llm_used": llm_used, "content": "".join(parts)},
+        time.monotonic() - started
+    )
+
+
+def _route_stream(system_prompt, user_prompt, temperature, use_cache):
+    cacheable = _cacheable(temperature, use_cache)
+
+    if cacheable:
+        cached = _cache_lookup(system_prompt, user_prompt, temperature)
+        if cached is not None:
+            yield {"llm_used": cached["llm_used"], "delta": cached["content"]}
+            return
+
+    for provider, client, model in _sync_providers():
+        if client is None:
+            print(f"⚠ {provider} client not available; skipping")
+            continue
+
+        if not circuit_breaker.get_breaker(provider).allow():
+            print(f"⚠ {provider} circuit open; skipping")
+            continue
+
+        stream = _open_stream(provider, client, model, system_prompt, user_prompt, temperature)
+        if stream is None:
+            continue
+
+        breaker = circuit_breaker.get_breaker(provider)
+        started = time.monotonic()
+        parts = []
+        finished = False
+
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield {"llm_used": provider, "delta": delta}
+            finished = True
+
         except Exception as e:
-            print("⚠ OpenRouter failed:", str(e))
-    else:
-        print("⚠ OpenRouter client not available; using hard fallback")
+            breaker.record_failure(time.monotonic() - started)
+            if parts:
+                raise LLMStreamError(f"{provider} stream interrupted: {e}") from e
+            print(f"⚠ {provider} stream error:", str(e))
+            continue
 
+        finally:
+            # Consumer stopped early: drop the connection, no health verdict
+            if not finished:
+                stream.close()
+                breaker.release()
 
+        breaker.record_success(time.monotonic() - started)
+
+        if cacheable:
+            _cache_store(
+                {"llm_used": provider, "content": "".join(parts)},
+                system_prompt, user_prompt, temperature
+            )
+        return
+
+    fallback = _hard_fallback()
+    yield {"llm_used": fallback["llm_used"], "delta": fallback["content"]}
+
+
+def _open_stream(provider, client, model, system_prompt, user_prompt, temperature):
+    limiter = rate_limiter.get_limiter(provider)
+    breaker = circuit_breaker.get_breaker(provider)
+
+    for _ in range(LLM_RATE_MAX_RETRIES + 1):
+        if not limiter.acquire():
+            print(f"⚠ {provider} queue wait exceeds {rate_limiter.LLM_RATE_MAX_WAIT}s; failing over")
+            breaker.release()
+            return None
+
+        started = time.monotonic()
+        try:
+            raw = client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=_messages(system_prompt, user_prompt),
+                temperature=temperature,
+                stream=True
+            )
+            limiter.on_success(raw.headers)
+            return raw.parse()
+
+        except (GroqRateLimitError, OpenAIRateLimitError) as e:
+            print(f"⚠ {provider} rate limit hit; waiting for capacity")
+            limiter.on_rate_limited(_error_headers(e))
+
+        except Exception as e:
+            print(f"⚠ {provider} error:", str(e))
+            breaker.record_failure(time.monotonic() - started)
+            return None
+
+    breaker.release()
+    return None
 
-    # -------------------------
-    # 3. HARD FALLBACK (NEVER CRASH)
-    # -------------------------
-    return {
-        "llm_used": "none",
-        "content": json.dumps({
-            "risk_level": "UNKNOWN",
-            "explanation": "LLM unavailable. Manual compliance review required.",
-            "regulation": "N/A"
-        })
-    }
 
 # =====================================================
 # JSON SAFE HELPER
 # =====================================================
-def chat_completion_json(system_prompt, user_prompt, temperature=0.2):
-    result = chat_completion(system_prompt, user_prompt, temperature)
+def chat_completion_json(system_prompt, user_prompt, temperature=0.2, use_cache=True, hedge=None):
+    result = chat_completion(system_prompt, user_prompt, temperature, use_cache, hedge)
+    return _parse_json_result(result, system_prompt, user_prompt, temperature, use_cache)
+
+
+def _parse_json_result(result, system_prompt, user_prompt, temperature, use_cache):
     content = result["content"]
 
     try:
@@ -162,6 +614,10 @@ def chat_completion_json(system_prompt, user_prompt, temperature=0.2):
             except Exception:
                 pass
 
+        # Do not keep serving an unparseable answer from the cache
+        if _cacheable(temperature, use_cache) and result["llm_used"] != "none":
+            _cache_invalidate(result, system_prompt, user_prompt, temperature)
+
         # FINAL SAFE RETURN (DO NOT CRASH PIPELINE)
         return {
             "risk_level": "UNKNOWN",
@@ -169,3 +625,314 @@ def chat_completion_json(system_prompt, user_prompt, temperature=0.2):
             "regulation": "N/A",
             "_llm_used": result["llm_used"]
         }
+
+
+# =====================================================
+# ASYNC CLIENTS (ONE POOL SET PER EVENT LOOP)
+# =====================================================
+# httpx async pools and asyncio semaphores are bound to the loop that
+# created them, so each running loop gets its own set.
+_async_states = weakref.WeakKeyDictionary()
+
+
+def _pool_limits():
+    return httpx.Limits(
+        max_connections=LLM_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_POOL_KEEPALIVE,
+        keepalive_expiry=60
+    )
+
+
+def _get_async_state():
+    loop = asyncio.get_running_loop()
+    state = _async_states.get(loop)
+    if state is not None:
+        return state
+
+    try:
+        agroq_client = AsyncGroq(
+            api_key=GROQ_API_KEY,
+            http_client=GroqAsyncHttpxClient(limits=_pool_limits())
+        )
+    except Exception:
+        agroq_client = None
+
+    try:
+        aopenrouter_client = AsyncOpenAI(
+            api_key=OPENROUTER_API_KEY,
+            base_url=OPENROUTER_BASE_URL,
+            http_client=OpenAIAsyncHttpxClient(limits=_pool_limits())
+        )
+    except Exception:
+        aopenrouter_client = None
+
+    state = {
+        "clients": {
+            "groq": agroq_client,
+            "openrouter-llama": aopenrouter_client
+        },
+        "slots": {
+            "groq": asyncio.Semaphore(GROQ_MAX_CONCURRENCY),
+            "openrouter-llama": asyncio.Semaphore(OPENROUTER_MAX_CONCURRENCY)
+        }
+    }
+    _async_states[loop] = state
+    return state
+
+
+async def aclose_async_clients():
+    """
+    Closes the connection pools owned by the current event loop.
+    Call before the loop shuts down to avoid unclosed-transport warnings.
+    """
+    state = _async_states.pop(asyncio.get_running_loop(), None)
+    if state is None:
+        return
+
+    for client in state["clients"].values():
+        if client is not None:
+            await client.close()
+
+
+# =====================================================
+# ASYNC ROUTER
+# =====================================================
+async def achat_completion(system_prompt, user_prompt, temperature=0.2, use_cache=True, hedge=None):
+    if llm_cassette.is_replaying():
+        return await _areplay(system_prompt, user_prompt, temperature)
+
+    cacheable = _cacheable(temperature, use_cache)
+
+    if cacheable:
+        cached = _cache_lookup(system_prompt, user_prompt, temperature)
+        if cached is not None:
+            return cached
+
+    started = time.monotonic()
+    if hedging.is_enabled(hedge):
+        result = await _aroute_hedged(system_prompt, user_prompt, temperature)
+    else:
+        result = await _aroute_completion(system_prompt, user_prompt, temperature)
+
+    if llm_cassette.is_recording():
+        llm_cassette.record(
+            system_prompt, user_prompt, temperature, result, time.monotonic() - started
+        )
+
+    if cacheable and result["llm_used"] != "none":
+        _cache_store(result, system_prompt, user_prompt, temperature)
+
+    return result
+
+
+async def _aroute_completion(system_prompt, user_prompt, temperature):
+    state = _get_async_state()
+
+    for provider, model in PROVIDER_ORDER:
+        client = state["clients"].get(provider)
+        if client is None:
+            print(f"⚠ {provider} client not available; skipping")
+            continue
+
+        if not circuit_breaker.get_breaker(provider).allow():
+            print(f"⚠ {provider} circuit open; skipping")
+            continue
+
+        content = await _atry_provider(
+            provider, client, state["slots"][provider],
+            model, system_prompt, user_prompt, temperature
+        )
+        if content is not None:
+            return {
+                "llm_used": provider,
+                "content": content
+            }
+
+    return _hard_fallback()
+
+
+async def _atry_provider(provider, client, slots, model, system_prompt, user_prompt, temperature, on_sent=None):
+    limiter = rate_limiter.get_limiter(provider)
+    breaker = circuit_breaker.get_breaker(provider)
+
+    for _ in range(LLM_RATE_MAX_RETRIES + 1):
+        if not await limiter.acquire_async():
+            print(f"⚠ {provider} queue wait exceeds {rate_limiter.LLM_RATE_MAX_WAIT}s; failing over")
+            breaker.release()
+            return None
+
+        started = time.monotonic()
+        try:
+            async with slots:
+                if on_sent:
+                    on_sent()
+                started = time.monotonic()
+                raw = await client.chat.completions.with_raw_response.create(
+                    model=model,
+                    messages=_messages(system_prompt, user_prompt),
+                    temperature=temperature
+                )
+            limiter.on_success(raw.headers)
+            content = (await _aparse(raw)).choices[0].message.content
+            breaker.record_success(time.monotonic() - started)
+            return content
+
+        except (GroqRateLimitError, OpenAIRateLimitError) as e:
+            print(f"⚠ {provider} rate limit hit; waiting for capacity")
+            limiter.on_rate_limited(_error_headers(e))
+
+        except asyncio.CancelledError:
+            # Losing side of a hedge: no verdict on provider health
+            breaker.release()
+            raise
+
+        except Exception as e:
+            print(f"⚠ {provider} error:", str(e))
+            breaker.record_failure(time.monotonic() - started)
+            return None
+
+    print(f"⚠ {provider} still rate limited after {LLM_RATE_MAX_RETRIES} retries; failing over")
+    breaker.release()
+    return None
+
+
+async def _aroute_hedged(system_prompt, user_prompt, temperature):
+    """
+    Async hedging: the loser is cancelled outright, so savings are only
+    measured when the primary wins (saved_s = 0).
+    """
+    state = _get_async_state()
+    providers = [
+        (provider, model) for provider, model in PROVIDER_ORDER
+        if state["clients"].get(provider) is not None
+    ]
+    if len(providers) < 2 or not circuit_breaker.get_breaker(providers[0][0]).allow():
+        return await _aroute_completion(system_prompt, user_prompt, temperature)
+
+    (primary, p_model), (secondary, s_model) = providers[:2]
+    args = (system_prompt, user_prompt, temperature)
+
+    def launch(provider, model, on_sent=None):
+        return asyncio.ensure_future(_atry_provider(
+            provider, state["clients"][provider], state["slots"][provider], model, *args, on_sent
+        ))
+
+    delay = hedging.hedge_delay(primary)
+    record = hedging.new_record(primary, secondary, delay)
+    started = time.monotonic()
+
+    # Deadline starts once the primary holds its rate-limit token and slot
+    sent = asyncio.Event()
+    tasks = {launch(primary, p_model, sent.set): primary}
+    try:
+        sent_waiter = asyncio.ensure_future(sent.wait())
+        try:
+            await asyncio.wait(set(tasks) | {sent_waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sent_waiter.cancel()
+
+        done, _ = await asyncio.wait(set(tasks), timeout=delay)
+
+        if not done and circuit_breaker.get_breaker(secondary).allow():
+            print(f"⏱ {primary} slower than {delay:.1f}s; hedging with {secondary}")
+            record["hedged"] = True
+            tasks[launch(secondary, s_model)] = secondary
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                content = task.result()
+                if content is None:
+                    continue
+
+                winner = tasks[task]
+                hedging.finish_record(record, winner, time.monotonic() - started)
+                if record["hedged"] and winner == primary:
+                    hedging.record_saving(record, 0.0)
+
+                return {
+                    "llm_used": winner,
+                    "content": content,
+                    "hedge": record
+                }
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    if not record["hedged"] and circuit_breaker.get_breaker(secondary).allow():
+        content = await _atry_provider(
+            secondary, state["clients"][secondary], state["slots"][secondary], s_model, *args
+        )
+        if content is not None:
+            hedging.finish_record(record, secondary, time.monotonic() - started)
+            return {
+                "llm_used": secondary,
+                "content": content,
+                "hedge": record
+            }
+
+    hedging.finish_record(record, None, time.monotonic() - started)
+    return _hard_fallback()
+
+
+async def _aparse(raw):
+    # Groq's async raw response parses lazily; OpenAI's legacy one does not
+    parsed = raw.parse()
+    if inspect.isawaitable(parsed):
+        parsed = await parsed
+    return parsed
+
+
+async def achat_completion_json(system_prompt, user_prompt, temperature=0.2, use_cache=True, hedge=None):
+    result = await achat_completion(system_prompt, user_prompt, temperature, use_cache, hedge)
+    return _parse_json_result(result, system_prompt, user_prompt, temperature, use_cache)
+
+
+# =====================================================
+# CACHE STATS
+# =====================================================
+def cache_stats():
+    return llm_cache.cache_stats()
+
+
+# =====================================================
+# RATE LIMIT STATS
+# =====================================================
+def rate_limit_stats():
+    """
+    Live per-provider limiter state: current rate, queue depth,
+    throttle counts and failovers.
+    """
+    return rate_limiter.limiter_stats()
+
+
+# =====================================================
+# PROVIDER HEALTH
+# =====================================================
+def breaker_states():
+    """
+    Per-provider circuit state (closed / open / half_open) with rolling
+    error rate, slow-call rate and latency percentiles, for dashboards.
+    """
+    return circuit_breaker.breaker_states()
+
+
+# =====================================================
+# HEDGING STATS
+# =====================================================
+def hedge_stats():
+    """
+    Hedged-call counts, wins per provider, measured time saved and the
+    most recent per-call records.
+    """
+    return hedging.hedge_stats()
+
+
+# =====================================================
+# CASSETTE STATS
+# =====================================================
+def cassette_stats():
+    return llm_cassette.cassette_stats()
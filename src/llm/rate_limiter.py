@@ -0,0 +1,297 @@
+# src/llm/rate_limiter.py
+
+import os
+import re
+import time
+import asyncio
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+# Starting (and ceiling) request rate per provider, in requests/minute
+PROVIDER_RPM = {
+    "groq": float(os.getenv("GROQ_RATE_LIMIT_RPM", "30")),
+    "openrouter-llama": float(os.getenv("OPENROUTER_RATE_LIMIT_RPM", "20"))
+}
+DEFAULT_RPM = float(os.getenv("LLM_RATE_LIMIT_RPM", "30"))
+
+# Requests allowed back-to-back before pacing kicks in
+LLM_RATE_BURST = float(os.getenv("LLM_RATE_BURST", "5"))
+
+# Longest a request may queue for a provider before failing over (seconds)
+LLM_RATE_MAX_WAIT = float(os.getenv("LLM_RATE_MAX_WAIT", "20"))
+
+# AIMD tuning: halve on 429, recover one request/minute per success
+AIMD_DECREASE = float(os.getenv("LLM_RATE_AIMD_DECREASE", "0.5"))
+AIMD_INCREASE_RPM = float(os.getenv("LLM_RATE_AIMD_INCREASE_RPM", "1"))
+AIMD_MIN_RPM = float(os.getenv("LLM_RATE_AIMD_MIN_RPM", "2"))
+
+# Most callers that may hold queued slots at once; beyond that, fail over
+LLM_RATE_MAX_DEBT = float(os.getenv("LLM_RATE_MAX_DEBT", "20"))
+
+
+# =====================================================
+# HEADER PARSING
+# =====================================================
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_duration(value):
+    """
+    Parses Retry-After / reset header values into seconds.
+    Accepts plain seconds ("7"), Groq style durations ("2m59.56s", "120ms")
+    and epoch timestamps in seconds or milliseconds.
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+
+    try:
+        number = float(value)
+    except ValueError:
+        number = None
+
+    if number is not None:
+        now = time.time()
+        if number > 1e12:   # epoch milliseconds
+            return max(0.0, number / 1000 - now)
+        if number > 1e9:    # epoch seconds
+            return max(0.0, number - now)
+        return max(0.0, number)
+
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+
+    scale = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+    return sum(float(n) * scale[unit] for n, unit in parts)
+
+
+def _header(headers, *names):
+    if not headers:
+        return None
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+# =====================================================
+# TOKEN BUCKET WITH AIMD
+# =====================================================
+class AdaptiveRateLimiter:
+    def __init__(self, name, rpm, burst=LLM_RATE_BURST):
+        self.name = name
+        self.max_rate = rpm / 60.0
+        self.min_rate = min(AIMD_MIN_RPM, rpm) / 60.0
+        self.rate = self.max_rate
+        self.burst = burst
+
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Bumped on every 429; slots reserved before it are void
+        self._generation = 0
+        self._requeue = threading.Condition(self._lock)
+
+        self._queued = 0
+        self._stats = {
+            "granted": 0,
+            "throttled": 0,
+            "total_wait_s": 0.0,
+            "rate_limited": 0,
+            "failovers": 0
+        }
+
+    # -------------------------
+    # Reservation
+    # -------------------------
+    def _refill(self, now):
+        # Nothing accrues while the provider has told us to back off
+        elapsed = now - max(self._last_refill, self._blocked_until)
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def reserve(self, max_wait=LLM_RATE_MAX_WAIT):
+        """
+        Claims the next slot and returns how long the caller must wait for
+        it, or None when that wait would exceed max_wait.
+        """
+        with self._lock:
+            return self._reserve(max_wait)
+
+    def _reserve(self, max_wait):
+        now = time.monotonic()
+        self._refill(now)
+
+        # Tokens may go negative: each queued caller owns one slot of debt.
+        # Debt is paid off from the end of any Retry-After block, so queued
+        # callers leave it one by one at the reduced rate
+        token_wait = max(0.0, 1 - self._tokens) / self.rate
+        block_wait = max(0.0, self._blocked_until - now)
+        wait = block_wait + token_wait
+
+        if wait > max_wait or self._tokens <= -LLM_RATE_MAX_DEBT:
+            self._stats["failovers"] += 1
+            return None
+
+        self._tokens -= 1
+        self._stats["granted"] += 1
+        if wait > 0:
+            self._queued += 1
+            self._stats["throttled"] += 1
+            self._stats["total_wait_s"] += wait
+
+        return wait
+
+    def _release_queue_slot(self):
+        with self._lock:
+            self._queued -= 1
+
+    def acquire(self, max_wait=LLM_RATE_MAX_WAIT):
+        deadline = time.monotonic() + max_wait
+
+        with self._requeue:
+            while True:
+                wait = self._reserve(deadline - time.monotonic())
+                if wait is None:
+                    return False
+                if wait <= 0:
+                    return True
+
+                # A 429 while queued voids the slot: wake and take a new one
+                generation = self._generation
+                try:
+                    self._requeue.wait_for(lambda: self._generation != generation, timeout=wait)
+                finally:
+                    self._queued -= 1
+                if self._generation == generation:
+                    return True
+
+    async def acquire_async(self, max_wait=LLM_RATE_MAX_WAIT):
+        deadline = time.monotonic() + max_wait
+
+        while True:
+            with self._lock:
+                wait = self._reserve(deadline - time.monotonic())
+                generation = self._generation
+            if wait is None:
+                return False
+            if wait <= 0:
+                return True
+
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._release_queue_slot()
+            if self._generation == generation:
+                return True
+
+    # -------------------------
+    # Feedback from responses
+    # -------------------------
+    def on_success(self, headers=None):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + AIMD_INCREASE_RPM / 60.0)
+
+            # Respect an exhausted quota reported by the provider
+            remaining = _header(
+                headers,
+                "x-ratelimit-remaining-requests",
+                "x-ratelimit-remaining"
+            )
+            if remaining is not None and str(remaining).strip() in ("0", "0.0"):
+                reset = parse_duration(_header(
+                    headers,
+                    "x-ratelimit-reset-requests",
+                    "x-ratelimit-reset"
+                ))
+                if reset:
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + reset
+                    )
+
+            remaining_tokens = _header(headers, "x-ratelimit-remaining-tokens")
+            if remaining_tokens is not None and str(remaining_tokens).strip() in ("0", "0.0"):
+                reset = parse_duration(_header(headers, "x-ratelimit-reset-tokens"))
+                if reset:
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + reset
+                    )
+
+    def on_rate_limited(self, headers=None):
+        with self._lock:
+            now = time.monotonic()
+            self._stats["rate_limited"] += 1
+            self.rate = max(self.min_rate, self.rate * AIMD_DECREASE)
+
+            retry_after = parse_duration(_header(
+                headers,
+                "retry-after",
+                "x-ratelimit-reset-requests",
+                "x-ratelimit-reset-tokens",
+                "x-ratelimit-reset"
+            ))
+            if retry_after is None:
+                retry_after = 1 / self.rate
+
+            self._refill(now)
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._last_refill = now
+
+            # Every queued slot is void and its holder will reserve again,
+            # so all debt is dropped: exactly one request may go at the end
+            # of the block, the rest follow at the reduced rate
+            self._tokens = 1.0
+            self._generation += 1
+            self._requeue.notify_all()
+
+    # -------------------------
+    # Observability
+    # -------------------------
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            stats = dict(self._stats)
+            stats.update({
+                "provider": self.name,
+                "rate_rpm": round(self.rate * 60, 2),
+                "max_rate_rpm": round(self.max_rate * 60, 2),
+                "queue_depth": self._queued,
+                "blocked_for_s": round(max(0.0, self._blocked_until - now), 2),
+                "total_wait_s": round(stats["total_wait_s"], 2)
+            })
+            return stats
+
+
+# =====================================================
+# PROCESS-WIDE REGISTRY
+# =====================================================
+_limiters = {}
+_registry_lock = threading.Lock()
+
+
+def get_limiter(provider):
+    with _registry_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(
+                provider, PROVIDER_RPM.get(provider, DEFAULT_RPM)
+            )
+            _limiters[provider] = limiter
+        return limiter
+
+
+def limiter_stats():
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
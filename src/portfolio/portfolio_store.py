@@ -0,0 +1,477 @@
+# src/portfolio/portfolio_store.py
+
+import os
+import json
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+PORTFOLIO_DB_PATH = Path(os.getenv("PORTFOLIO_DB_PATH", "data/portfolio/portfolio.sqlite3"))
+
+_lock = threading.Lock()
+_conn = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    contract_id TEXT PRIMARY KEY,
+    contract_name TEXT,
+    source_path TEXT,
+    overall_status TEXT,
+    severity TEXT,
+    last_run_id TEXT,
+    last_run_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS clauses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    contract_id TEXT NOT NULL,
+    clause_id TEXT,
+    clause_type TEXT,
+    clause_heading TEXT,
+    clause_text TEXT,
+    start_offset INTEGER,
+    end_offset INTEGER,
+    duplicate_ids TEXT
+);
+
+CREATE TABLE IF NOT EXISTS risk_assessments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    clause_ref INTEGER NOT NULL REFERENCES clauses(id),
+    run_id TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    contract_id TEXT NOT NULL,
+    clause_id TEXT,
+    severity TEXT,
+    risk_score REAL,
+    explanation TEXT,
+    source TEXT,
+    reused_from TEXT,
+    risk TEXT
+);
+
+-- One row per implicated regulation, so regulation lookups can use an index
+CREATE TABLE IF NOT EXISTS assessment_regulations (
+    clause_ref INTEGER NOT NULL REFERENCES clauses(id),
+    run_id TEXT NOT NULL,
+    contract_id TEXT NOT NULL,
+    clause_id TEXT,
+    regulation TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    contract_id TEXT NOT NULL,
+    clause_id TEXT,
+    regulation TEXT,
+    issue_type TEXT,
+    severity TEXT,
+    explanation TEXT,
+    source TEXT
+);
+
+CREATE TABLE IF NOT EXISTS amendments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    contract_id TEXT NOT NULL,
+    clause_id TEXT,
+    amended_text TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_clauses_run ON clauses(run_id, clause_id);
+CREATE INDEX IF NOT EXISTS idx_clauses_type ON clauses(clause_type);
+CREATE INDEX IF NOT EXISTS idx_clauses_run_at ON clauses(run_at);
+CREATE INDEX IF NOT EXISTS idx_risk_clause ON risk_assessments(clause_ref);
+CREATE INDEX IF NOT EXISTS idx_risk_severity ON risk_assessments(severity);
+CREATE INDEX IF NOT EXISTS idx_risk_run_at ON risk_assessments(run_at);
+CREATE INDEX IF NOT EXISTS idx_regulations ON assessment_regulations(regulation);
+CREATE INDEX IF NOT EXISTS idx_regulations_clause ON assessment_regulations(clause_ref);
+CREATE INDEX IF NOT EXISTS idx_issues_severity ON issues(severity);
+CREATE INDEX IF NOT EXISTS idx_issues_regulation ON issues(regulation);
+CREATE INDEX IF NOT EXISTS idx_issues_run_at ON issues(run_at);
+CREATE INDEX IF NOT EXISTS idx_amendments_run ON amendments(run_id);
+CREATE INDEX IF NOT EXISTS idx_contracts_run_at ON contracts(last_run_at);
+"""
+
+
+# =====================================================
+# STORAGE
+# =====================================================
+def _get_conn():
+    global _conn
+
+    if _conn is None:
+        PORTFOLIO_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(PORTFOLIO_DB_PATH), check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.executescript(SCHEMA)
+        _conn.commit()
+
+    return _conn
+
+
+def _regulations(risk):
+    regs = risk.get("regulation_violations") or []
+    if isinstance(regs, str):
+        regs = [regs]
+    return [str(r) for r in regs if r]
+
+
+def _insert_clause(conn, run_id, run_at, contract_id, c):
+    cid = None if c.get("clause_id") is None else str(c.get("clause_id"))
+    risk = c.get("risk") if isinstance(c.get("risk"), dict) else {}
+
+    clause_ref = conn.execute(
+        """
+        INSERT INTO clauses
+            (run_id, run_at, contract_id, clause_id, clause_type, clause_heading,
+             clause_text, start_offset, end_offset, duplicate_ids)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            run_id, run_at, contract_id, cid,
+            c.get("clause_type"), c.get("clause_heading"), c.get("clause_text"),
+            c.get("start"), c.get("end"),
+            json.dumps(c.get("duplicate_ids", []))
+        )
+    ).lastrowid
+
+    conn.execute(
+        """
+        INSERT INTO risk_assessments
+            (clause_ref, run_id, run_at, contract_id, clause_id, severity, risk_score,
+             explanation, source, reused_from, risk)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            clause_ref, run_id, run_at, contract_id, cid,
+            (risk.get("severity") or risk.get("risk_level") or "").lower() or None,
+            risk.get("risk_score") if isinstance(risk.get("risk_score"), (int, float)) else None,
+            risk.get("explanation"),
+            risk.get("_llm_used"),
+            json.dumps(risk["reused_from"]) if risk.get("reused_from") else None,
+            json.dumps(risk, ensure_ascii=False, default=str)
+        )
+    )
+
+    conn.executemany(
+        """
+        INSERT INTO assessment_regulations (clause_ref, run_id, contract_id, clause_id, regulation)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [(clause_ref, run_id, contract_id, cid, reg) for reg in _regulations(risk)]
+    )
+
+
+# =====================================================
+# WRITE (ONE CALL PER PIPELINE RUN)
+# =====================================================
+def record_run(run_id, contract, clauses, issues, amendments, run_at=None):
+    """
+    Stores one pipeline run in a single transaction.
+
+    contract   → dict with contract_id, contract_name, source_path,
+                 overall_status, severity
+    clauses    → assessed clause dicts (each with "risk")
+    issues     → compliance_report["issues"]
+    amendments → {clause_id: amended clause text}
+
+    Earlier runs of the same contract are kept; queries read the latest
+    run per contract unless asked otherwise.
+    """
+    run_at = run_at or datetime.utcnow().isoformat() + "Z"
+    contract_id = contract["contract_id"]
+
+    issue_rows = [
+        (
+            run_id, run_at, contract_id,
+            None if i.get("clause_id") is None else str(i.get("clause_id")),
+            i.get("regulation"), i.get("issue_type"),
+            (i.get("severity") or "").lower() or None,
+            i.get("explanation"), i.get("source")
+        )
+        for i in issues
+    ]
+    amendment_rows = [
+        (run_id, run_at, contract_id, str(cid), text)
+        for cid, text in amendments.items()
+    ]
+
+    with _lock:
+        conn = _get_conn()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO contracts
+                    (contract_id, contract_name, source_path, overall_status, severity, last_run_id, last_run_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(contract_id) DO UPDATE SET
+                    contract_name = excluded.contract_name,
+                    source_path = excluded.source_path,
+                    overall_status = excluded.overall_status,
+                    severity = excluded.severity,
+                    last_run_id = excluded.last_run_id,
+                    last_run_at = excluded.last_run_at
+                """,
+                (
+                    contract_id, contract.get("contract_name"), contract.get("source_path"),
+                    contract.get("overall_status"), contract.get("severity"),
+                    run_id, run_at
+                )
+            )
+            for c in clauses:
+                _insert_clause(conn, run_id, run_at, contract_id, c)
+
+            conn.executemany(
+                """
+                INSERT INTO issues
+                    (run_id, run_at, contract_id, clause_id, regulation, issue_type,
+                     severity, explanation, source)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                issue_rows
+            )
+            conn.executemany(
+                "INSERT INTO amendments (run_id, run_at, contract_id, clause_id, amended_text) VALUES (?, ?, ?, ?, ?)",
+                amendment_rows
+            )
+
+
+# =====================================================
+# QUERY API
+# =====================================================
+def _query(sql, params):
+    with _lock:
+        rows = _get_conn().execute(sql, params).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _latest_join(alias, latest_only):
+    if not latest_only:
+        return ""
+    return f" JOIN contracts k ON k.contract_id = {alias}.contract_id AND k.last_run_id = {alias}.run_id"
+
+
+def _clause_filters(severity=None, clause_type=None, regulation=None, contract_id=None, since=None):
+    where, params = [], []
+
+    if severity:
+        where.append("r.severity = ?")
+        params.append(severity.lower())
+    if clause_type:
+        where.append("c.clause_type = ?")
+        params.append(clause_type)
+    if regulation:
+        where.append(
+            "EXISTS (SELECT 1 FROM assessment_regulations g"
+            " WHERE g.clause_ref = c.id AND g.regulation = ?)"
+        )
+        params.append(regulation)
+    if contract_id:
+        where.append("c.contract_id = ?")
+        params.append(contract_id)
+    if since:
+        where.append("c.run_at >= ?")
+        params.append(since)
+    return where, params
+
+
+def query_clauses(severity=None, clause_type=None, regulation=None, contract_id=None,
+                  since=None, latest_only=True, limit=1000):
+    """
+    Clauses with their risk, filtered by any combination of severity,
+    clause_type, regulation, contract and run timestamp (ISO, >= since).
+    """
+    join = _latest_join("c", latest_only)
+    where, params = _clause_filters(severity, clause_type, regulation, contract_id, since)
+
+    sql = (
+        "SELECT c.contract_id, c.run_id, c.run_at, c.clause_id, c.clause_type, c.clause_heading,"
+        " c.clause_text, r.severity, r.risk_score, r.explanation, r.source"
+        " FROM clauses c"
+        " JOIN risk_assessments r ON r.clause_ref = c.id"
+        + join
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + " ORDER BY c.run_at DESC, c.id LIMIT ?"
+    )
+    return _query(sql, params + [limit])
+
+
+def contracts_with(severity=None, clause_type=None, regulation=None, since=None, status=None):
+    """
+    e.g. contracts_with(severity="high", clause_type="Data Protection")
+    → one row per contract with the number of matching clauses in its
+    latest run. All filters, including the contract's overall status,
+    are combined with AND.
+    """
+    where, params = _clause_filters(severity, clause_type, regulation, since=since)
+    if status:
+        where.append("k.overall_status = ?")
+        params.append(status)
+
+    sql = (
+        "SELECT c.contract_id, k.overall_status, COUNT(*) AS matching_clauses"
+        " FROM clauses c"
+        " JOIN risk_assessments r ON r.clause_ref = c.id"
+        + _latest_join("c", True)
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + " GROUP BY c.contract_id ORDER BY matching_clauses DESC, c.contract_id"
+    )
+    return _query(sql, params)
+
+
+def query_issues(severity=None, regulation=None, contract_id=None, since=None,
+                 latest_only=True, limit=1000):
+    join = _latest_join("i", latest_only)
+    where, params = [], []
+
+    if severity:
+        where.append("i.severity = ?")
+        params.append(severity.lower())
+    if regulation:
+        where.append("i.regulation = ?")
+        params.append(regulation)
+    if contract_id:
+        where.append("i.contract_id = ?")
+        params.append(contract_id)
+    if since:
+        where.append("i.run_at >= ?")
+        params.append(since)
+
+    sql = (
+        "SELECT i.contract_id, i.run_id, i.run_at, i.clause_id, i.regulation, i.issue_type,"
+        " i.severity, i.explanation FROM issues i"
+        + join
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + " ORDER BY i.run_at DESC, i.id LIMIT ?"
+    )
+    return _query(sql, params + [limit])
+
+
+def list_contracts(status=None, since=None):
+    where, params = [], []
+    if status:
+        where.append("overall_status = ?")
+        params.append(status)
+    if since:
+        where.append("last_run_at >= ?")
+        params.append(since)
+
+    sql = (
+        "SELECT * FROM contracts"
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + " ORDER BY last_run_at DESC"
+    )
+    return _query(sql, params)
+
+
+def portfolio_summary():
+    """
+    Clause counts by severity and clause_type over the latest run of
+    every contract.
+    """
+    rows = _query(
+        "SELECT c.clause_type, r.severity, COUNT(*) AS clauses"
+        " FROM clauses c"
+        " JOIN risk_assessments r ON r.clause_ref = c.id"
+        " JOIN contracts k ON k.contract_id = c.contract_id AND k.last_run_id = c.run_id"
+        " GROUP BY c.clause_type, r.severity ORDER BY clauses DESC",
+        []
+    )
+    contracts = _query("SELECT COUNT(*) AS n FROM contracts", [])[0]["n"]
+    return {"contracts": contracts, "by_type_and_severity": rows}
+
+
+# =====================================================
+# CLI
+# =====================================================
+def _print_rows(rows, as_json):
+    if as_json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+
+    if not rows:
+        print("No results.")
+        return
+
+    columns = [k for k in rows[0].keys() if k not in ("clause_text", "explanation")]
+    print("\t".join(columns))
+    for r in rows:
+        print("\t".join("" if r[k] is None else str(r[k]) for k in columns))
+    print(f"({len(rows)} rows)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the contract portfolio risk store")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("clauses", help="Clauses with their risk")
+    p.add_argument("--severity")
+    p.add_argument("--clause-type")
+    p.add_argument("--regulation")
+    p.add_argument("--contract")
+    p.add_argument("--since", help="ISO timestamp, e.g. 2025-01-01")
+    p.add_argument("--all-runs", action="store_true", help="Include superseded runs")
+    p.add_argument("--limit", type=int, default=100)
+
+    p = sub.add_parser("contracts", help="Contracts, optionally only those with matching clauses")
+    p.add_argument("--severity")
+    p.add_argument("--clause-type")
+    p.add_argument("--regulation")
+    p.add_argument("--status")
+    p.add_argument("--since")
+
+    p = sub.add_parser("issues", help="Compliance issues")
+    p.add_argument("--severity")
+    p.add_argument("--regulation")
+    p.add_argument("--contract")
+    p.add_argument("--since")
+    p.add_argument("--all-runs", action="store_true")
+    p.add_argument("--limit", type=int, default=100)
+
+    sub.add_parser("summary", help="Clause counts by type and severity")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "clauses":
+        rows = query_clauses(
+            severity=args.severity, clause_type=args.clause_type, regulation=args.regulation,
+            contract_id=args.contract, since=args.since,
+            latest_only=not args.all_runs, limit=args.limit
+        )
+    elif args.command == "contracts":
+        if args.severity or args.clause_type or args.regulation:
+            rows = contracts_with(
+                severity=args.severity, clause_type=args.clause_type,
+                regulation=args.regulation, since=args.since, status=args.status
+            )
+        else:
+            rows = list_contracts(status=args.status, since=args.since)
+    elif args.command == "issues":
+        rows = query_issues(
+            severity=args.severity, regulation=args.regulation, contract_id=args.contract,
+            since=args.since, latest_only=not args.all_runs, limit=args.limit
+        )
+    else:
+        print(json.dumps(portfolio_summary(), indent=2))
+        return
+
+    _print_rows(rows, args.json)
+
+
+if __name__ == "__main__":
+    main()
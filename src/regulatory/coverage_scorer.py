@@ -0,0 +1,137 @@
+# src/regulatory/coverage_scorer.py
+
+import os
+import re
+import zlib
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+COVERAGE_HASH_DIM = int(os.getenv("COVERAGE_HASH_DIM", str(2 ** 18)))
+
+# best similarity ≥ COVERED → covered, < MISSING → missing,
+# anything in between is borderline and goes to the LLM
+COVERAGE_COVERED_THRESHOLD = float(os.getenv("COVERAGE_COVERED_THRESHOLD", "0.18"))
+COVERAGE_MISSING_THRESHOLD = float(os.getenv("COVERAGE_MISSING_THRESHOLD", "0.08"))
+
+_STOPWORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "its", "of", "on", "or", "such", "that", "the", "this", "to",
+    "with", "shall", "will", "may", "all", "each", "other", "under", "party",
+    "parties", "agreement"
+}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+# =====================================================
+# HASHING TF-IDF
+# =====================================================
+def _stem(word):
+    # Crude suffix folding so "retain" / "retained" / "retains" share a bucket
+    for suffix in ("ations", "ation", "ings", "ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix) and not word.endswith("ss"):
+            return word[:-len(suffix)]
+    return word
+
+
+def _features(text):
+    words = [_stem(w) for w in _WORD_RE.findall((text or "").lower()) if w not in _STOPWORDS]
+    # Unigrams plus bigrams, so "breach notification" outweighs two stray words
+    return words + [a + " " + b for a, b in zip(words, words[1:])]
+
+
+def _hashed_counts(texts):
+    """
+    Sparse term counts for every text as (row, column, count) arrays,
+    with hashed columns remapped to the features actually present.
+    """
+    rows, cols = [], []
+    for i, text in enumerate(texts):
+        hashes = [zlib.crc32(f.encode("utf-8")) % COVERAGE_HASH_DIM for f in _features(text)]
+        rows.extend([i] * len(hashes))
+        cols.extend(hashes)
+
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    _, cols = np.unique(cols, return_inverse=True)
+    return rows, cols.reshape(-1)
+
+
+def tfidf_matrix(texts):
+    """
+    L2-normalised TF-IDF rows for texts, over a shared hashed vocabulary.
+    """
+    rows, cols = _hashed_counts(texts)
+    width = int(cols.max()) + 1 if cols.size else 1
+
+    counts = np.zeros((len(texts), width), dtype=np.float32)
+    np.add.at(counts, (rows, cols), 1.0)
+
+    tf = np.log1p(counts)
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+    weights = tf * idf.astype(np.float32)
+
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return weights / norms
+
+
+# =====================================================
+# COVERAGE
+# =====================================================
+def score_coverage(requirements, clauses):
+    """
+    requirements: [{"regulation", "required_clause", "description"}]
+
+    Embeds requirement descriptions and clause texts together and computes
+    the full requirements × clauses cosine matrix in one product. Returns,
+    per requirement, the best-matching clause, its similarity as
+    coverage_confidence and a status of covered / borderline / missing.
+    An exact clause_type match counts as full coverage.
+    """
+    if not requirements:
+        return []
+
+    clause_texts = [
+        f"{c.get('clause_heading') or ''} {c.get('clause_text') or ''}" for c in clauses
+    ]
+    vectors = tfidf_matrix([r["description"] for r in requirements] + clause_texts)
+    req_vecs, clause_vecs = vectors[:len(requirements)], vectors[len(requirements):]
+
+    if clauses:
+        similarity = req_vecs @ clause_vecs.T
+    else:
+        similarity = np.zeros((len(requirements), 0), dtype=np.float32)
+
+    clause_types = np.array([(c.get("clause_type") or "").lower().strip() for c in clauses])
+    for i, r in enumerate(requirements):
+        similarity[i, clause_types == r["required_clause"].lower().strip()] = 1.0
+
+    results = []
+    for i, r in enumerate(requirements):
+        row = similarity[i]
+        ranked = np.argsort(-row)[:3] if row.size else []
+        best = float(row[ranked[0]]) if row.size else 0.0
+
+        if best >= COVERAGE_COVERED_THRESHOLD:
+            status = "covered"
+        elif best < COVERAGE_MISSING_THRESHOLD:
+            status = "missing"
+        else:
+            status = "borderline"
+
+        results.append({
+            **r,
+            "coverage_confidence": round(best, 3),
+            "status": status,
+            "best_clause_id": clauses[ranked[0]].get("clause_id") if row.size else None,
+            "candidate_clause_ids": [clauses[j].get("clause_id") for j in ranked]
+        })
+
+    return results
@@ -0,0 +1,258 @@
+# src/regulatory/feed_tracker.py
+
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import feedparser
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+FEED_SNAPSHOT_DIR = Path(os.getenv("FEED_SNAPSHOT_DIR", "data/regulations"))
+FEED_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+
+# Optional JSON list of extra / overriding sources, same shape as FEED_SOURCES
+FEED_SOURCES_FILE = os.getenv("FEED_SOURCES_FILE")
+
+FEED_MAX_WORKERS = int(os.getenv("FEED_MAX_WORKERS", "8"))
+FEED_TIMEOUT = float(os.getenv("FEED_TIMEOUT", "10"))
+
+# =====================================================
+# SOURCE REGISTRY
+# =====================================================
+# parser:
+#   feed          → RSS / Atom, one update per entry
+#   html_headings → one update per element matching selector (up to limit)
+#   html_text     → whole page text as a single update
+FEED_SOURCES = [
+    {
+        "name": "GDPR",
+        "url": "https://edpb.europa.eu/news/news_en",
+        "parser": "html_headings",
+        "selector": "h3",
+        "limit": 5,
+        "summary": "Source: EDPB website"
+    },
+    {
+        "name": "HIPAA",
+        "url": "https://www.hhs.gov/hipaa/for-professionals/security/index.html",
+        "parser": "html_text",
+        "title": "HIPAA Security Rule Update",
+        "max_chars": 800,
+        "published": "Refer official website"
+    }
+]
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def load_sources():
+    sources = {s["name"]: s for s in FEED_SOURCES}
+
+    if FEED_SOURCES_FILE:
+        try:
+            with open(FEED_SOURCES_FILE, "r", encoding="utf-8") as f:
+                for s in json.load(f):
+                    sources[s["name"]] = s
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠ Could not load feed sources from {FEED_SOURCES_FILE}: {e}")
+
+    return list(sources.values())
+
+
+# =====================================================
+# HTTP (POOLED SESSION)
+# =====================================================
+def _get_session():
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=FEED_MAX_WORKERS, pool_maxsize=FEED_MAX_WORKERS)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session.headers["User-Agent"] = "AI-Compliance-Checker/1.0 (regulatory feed tracker)"
+        return _session
+
+
+# =====================================================
+# PARSERS (ONE PASS OVER THE FETCHED BODY)
+# =====================================================
+def _parse_feed(source, response):
+    feed = feedparser.parse(response.content)
+    return [
+        {
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", ""),
+            "link": entry.get("link", ""),
+            "published": entry.get("published", "")
+        }
+        for entry in feed.entries[:source.get("limit")]
+    ]
+
+
+def _parse_html_headings(source, response):
+    soup = BeautifulSoup(response.text, "html.parser")
+    return [
+        {
+            "title": el.get_text(strip=True),
+            "summary": source.get("summary", ""),
+            "link": source["url"],
+            "published": source.get("published", "Unknown")
+        }
+        for el in soup.select(source.get("selector", "h3"))[:source.get("limit", 5)]
+    ]
+
+
+def _parse_html_text(source, response):
+    soup = BeautifulSoup(response.text, "html.parser")
+    text = soup.get_text(separator=" ", strip=True)[:source.get("max_chars", 800)]
+    return [{
+        "title": source.get("title", f"{source['name']} Update"),
+        "summary": text,
+        "link": source["url"],
+        "published": source.get("published", "Unknown")
+    }]
+
+
+PARSERS = {
+    "feed": _parse_feed,
+    "html_headings": _parse_html_headings,
+    "html_text": _parse_html_text
+}
+
+
+# =====================================================
+# SNAPSHOT HELPERS
+# =====================================================
+def _snapshot_file(name):
+    return FEED_SNAPSHOT_DIR / f"{name.lower()}_feed_snapshot.json"
+
+
+def hash_updates(updates):
+    payload = json.dumps(updates, sort_keys=True).encode("utf-8")
+    return hashlib.md5(payload).hexdigest()
+
+
+def load_snapshot(name):
+    path = _snapshot_file(name)
+    if not path.exists():
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_snapshot(name, updates, hash_value, etag=None, last_modified=None):
+    snapshot = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "updates": updates,
+        "hash": hash_value,
+        "etag": etag,
+        "last_modified": last_modified
+    }
+
+    with open(_snapshot_file(name), "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=2)
+
+    return snapshot
+
+
+# =====================================================
+# CORE DETECTOR
+# =====================================================
+def _result(name, has_new, source, entries, message):
+    return {
+        "source": name,
+        "has_new_updates": has_new,
+        "data_source": source,
+        "new_entries": entries,
+        "message": message
+    }
+
+
+def detect_source_changes(source):
+    """
+    Conditional GET of one source: unchanged feeds answer 304 and cost
+    no parsing; otherwise the body is parsed once and diffed against the
+    stored snapshot.
+    """
+    name = source["name"]
+    snapshot = load_snapshot(name)
+
+    headers = {}
+    if snapshot and snapshot.get("etag"):
+        headers["If-None-Match"] = snapshot["etag"]
+    if snapshot and snapshot.get("last_modified"):
+        headers["If-Modified-Since"] = snapshot["last_modified"]
+
+    try:
+        response = _get_session().get(source["url"], headers=headers, timeout=FEED_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"{name} fetch failed:", e)
+        return _result(name, False, "error", [], f"{name} source unreachable.")
+
+    if response.status_code == 304:
+        return _result(name, False, "not_modified", [], f"No new {name} regulatory updates.")
+
+    if response.status_code != 200:
+        print(f"{name} fetch failed: HTTP {response.status_code}")
+        return _result(name, False, "error", [], f"{name} source returned HTTP {response.status_code}.")
+
+    parser = source.get("parser", "feed")
+    try:
+        updates = PARSERS[parser](source, response)
+    except Exception as e:
+        print(f"{name} parsing failed:", e)
+        return _result(name, False, "error", [], f"{name} source could not be parsed.")
+
+    latest_hash = hash_updates(updates)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    save_snapshot(name, updates, latest_hash, etag, last_modified)
+
+    if snapshot is None or snapshot.get("hash") is None:
+        return _result(name, True, parser, updates, f"Initial {name} dataset stored.")
+
+    if snapshot["hash"] == latest_hash:
+        return _result(name, False, parser, [], f"No new {name} regulatory updates.")
+
+    prev_titles = {u["title"] for u in snapshot.get("updates") or []}
+    new_entries = [u for u in updates if u["title"] not in prev_titles]
+
+    return _result(
+        name, len(new_entries) > 0, parser, new_entries,
+        f"{len(new_entries)} new {name} updates detected."
+    )
+
+
+def detect_changes(names=None, max_workers=FEED_MAX_WORKERS):
+    """
+    Polls every registered source (or just names) concurrently over one
+    pooled session. Returns {source_name: result}.
+    """
+    sources = [s for s in load_sources() if names is None or s["name"] in names]
+    if not sources:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(sources)), thread_name_prefix="feed") as pool:
+        results = list(pool.map(detect_source_changes, sources))
+
+    return {r["source"]: r for r in results}
+
+
+if __name__ == "__main__":
+    print(json.dumps(detect_changes(), indent=2))
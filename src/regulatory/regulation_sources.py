@@ -1,5 +1,16 @@
+import os
 import json
 from pathlib import Path
+from dotenv import load_dotenv
+
+from src.regulatory.rule_packs import get_matcher, pack_regulations
+
+load_dotenv()
+
+# Rule packs checked by default (comma-separated, "all" for every pack).
+# Each extra regulation adds work and findings, so packs such as SOC2 or
+# PCI_DSS are opt-in per deployment or per contract.
+REGULATION_PACKS = os.getenv("REGULATION_PACKS", "GDPR,HIPAA")
 
 REGULATIONS_FILE = Path("data/regulations/regulations.json")
 REGULATIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -22,10 +33,58 @@ DEFAULT_REGULATIONS = {
     }
 }
 
-def load_regulations():
+def requirement_description(required_clause, regulation=None):
+    """
+    Text used to match a required clause against contract clauses: its
+    name plus the synonyms from the regulation's rule pack (or from any
+    pack that defines a clause of the same name).
+    """
+    matcher = get_matcher()
+    spec = matcher.requirement(regulation, required_clause)
+    if spec is None:
+        for reg in matcher.regulations:
+            spec = matcher.requirement(reg, required_clause)
+            if spec:
+                break
+    return " ".join([required_clause] + (spec["synonyms"] if spec else []))
+
+
+def _pack_names(packs, available):
+    if packs is None:
+        packs = REGULATION_PACKS
+    if isinstance(packs, str):
+        packs = packs.split(",")
+
+    names = [p.strip() for p in packs if p and p.strip()]
+    if any(n.lower() == "all" for n in names):
+        return list(available)
+
+    by_upper = {name.upper(): name for name in available}
+    selected = []
+    for n in names:
+        if n.upper() in by_upper:
+            selected.append(by_upper[n.upper()])
+        else:
+            print(f"⚠ Unknown rule pack: {n}")
+    return selected
+
+
+def load_regulations(packs=None):
+    """
+    Regulations from regulations.json plus the requested rule packs:
+    packs is a list or comma-separated string of pack names (default
+    REGULATION_PACKS, "all" for every pack).
+    """
     if not REGULATIONS_FILE.exists():
         with open(REGULATIONS_FILE, "w", encoding="utf-8") as f:
             json.dump(DEFAULT_REGULATIONS, f, indent=2)
 
     with open(REGULATIONS_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+        regulations = json.load(f)
+
+    # Rule packs add regulations; the file wins where both define one
+    available = pack_regulations()
+    for name in _pack_names(packs, available):
+        regulations.setdefault(name, available[name])
+
+    return regulations
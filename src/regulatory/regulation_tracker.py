@@ -1,11 +1,129 @@
+import json
 from typing import List, Dict
 
+from src.llm.llm_router import chat_completion_json
+from src.regulatory.coverage_scorer import score_coverage, COVERAGE_MISSING_THRESHOLD
+from src.regulatory.regulation_sources import requirement_description
+from src.regulatory.rule_packs import get_matcher, negated
+
 
 # ---------------------------------------------------------
-# Helper: Normalize clause types for comparison
+# Borderline Coverage Escalation
 # ---------------------------------------------------------
-def _normalize(text: str) -> str:
-    return text.lower().strip()
+ESCALATION_SYSTEM_PROMPT = """
+You are a senior regulatory compliance expert.
+For each requirement, decide whether the candidate contract clauses
+clearly and sufficiently cover it. Vague or partial coverage is NOT covered.
+Return ONLY valid JSON.
+"""
+
+ESCALATION_USER_PROMPT = """
+REQUIREMENTS WITH CANDIDATE CLAUSES:
+{requirements}
+
+Return a JSON array in the following format ONLY:
+
+[
+  {{
+    "index": <requirement index>,
+    "covered": true | false,
+    "reason": "<one sentence>"
+  }}
+]
+"""
+
+
+def resolve_borderline(borderline: List[Dict], clauses: List[Dict]) -> Dict:
+    """
+    One LLM call for every borderline requirement. Returns
+    {index: {"covered", "reason"}}; requirements the answer skips are
+    absent. Raises RuntimeError when the call fails or the answer is
+    not a JSON array.
+    """
+    by_id = {str(c.get("clause_id")): c for c in clauses}
+    payload = [
+        {
+            "index": i,
+            "regulation": r["regulation"],
+            "requirement": r["required_clause"],
+            "candidate_clauses": [
+                (by_id.get(str(cid)) or {}).get("clause_text", "")
+                for cid in r["candidate_clause_ids"]
+            ]
+        }
+        for i, r in enumerate(borderline)
+    ]
+
+    try:
+        response = chat_completion_json(
+            system_prompt=ESCALATION_SYSTEM_PROMPT,
+            user_prompt=ESCALATION_USER_PROMPT.format(
+                requirements=json.dumps(payload, ensure_ascii=False)
+            ),
+            temperature=0.0
+        )
+    except Exception as e:
+        raise RuntimeError(f"coverage escalation failed: {e}") from e
+
+    items = response.get("data") if isinstance(response, dict) else response
+    if not isinstance(items, list):
+        raise RuntimeError(
+            f"coverage escalation returned no verdicts (llm: {(response or {}).get('_llm_used')})"
+        )
+
+    verdicts = {}
+    for item in items:
+        if isinstance(item, dict) and isinstance(item.get("index"), int):
+            verdicts[item["index"]] = item
+    return verdicts
+
+
+# ---------------------------------------------------------
+# Local Coverage (No LLM)
+# ---------------------------------------------------------
+def local_coverage(clauses: List[Dict], regulations: Dict) -> List[Dict]:
+    """
+    Coverage of every required clause scored locally with TF-IDF (see
+    score_coverage). Rule-pack indicator phrases are evidence, not a
+    verdict: a hit lifts a "missing" requirement to "borderline" and
+    puts the hit clauses first among the candidates. A "covered" score
+    whose best clause contains a negation is also sent back to
+    "borderline". Only "borderline" entries need the LLM.
+    """
+    indicated = get_matcher().find_requirements(clauses)
+    by_id = {str(c.get("clause_id")): c for c in clauses}
+
+    requirements = [
+        {
+            "regulation": regulation_name,
+            "required_clause": required,
+            "description": requirement_description(required, regulation_name)
+        }
+        for regulation_name, rules in regulations.items()
+        for required in rules.get("required_clauses", [])
+    ]
+    coverage = score_coverage(requirements, clauses)
+
+    for r in coverage:
+        best = by_id.get(str(r["best_clause_id"])) or {}
+        exact_type = (best.get("clause_type") or "").lower().strip() == r["required_clause"].lower().strip()
+        if r["status"] == "covered" and not exact_type and negated(best.get("clause_text") or ""):
+            r["status"] = "borderline"
+
+        clause_ids = indicated.get((r["regulation"], r["required_clause"]))
+        if not clause_ids:
+            continue
+
+        candidates = clause_ids + [cid for cid in r["candidate_clause_ids"] if cid not in clause_ids]
+        r["candidate_clause_ids"] = candidates[:3]
+        if r["status"] == "missing":
+            r.update(
+                status="borderline",
+                coverage_confidence=max(r["coverage_confidence"], COVERAGE_MISSING_THRESHOLD),
+                best_clause_id=clause_ids[0]
+            )
+
+    return coverage
 
 
 # ---------------------------------------------------------
@@ -14,31 +132,52 @@ def _normalize(text: str) -> str:
 def check_compliance(
     clauses: List[Dict],
     regulations: Dict,
-    live_gdpr_updates: Dict = None,
-    live_hipaa_updates: Dict = None
+    live_updates: Dict = None,
+    escalate_borderline: bool = True
 ):
 
     compliance_issues = []
 
-    # Extract clause types and texts
-    clause_types = {_normalize(c.get("clause_type", "")) for c in clauses}
-    clause_texts = [_normalize(c.get("clause_text", "")) for c in clauses]
-
     # -----------------------------------------------------
     # 1. Baseline Regulatory Compliance Check
     # -----------------------------------------------------
-    for regulation_name, rules in regulations.items():
-        required_clauses = rules.get("required_clauses", [])
-
-        for required in required_clauses:
-            if _normalize(required) not in clause_types:
-                compliance_issues.append({
-                    "regulation": regulation_name,
-                    "issue_type": "missing_clause",
-                    "required_clause": required,
-                    "severity": "high",
-                    "source": "baseline_regulation"
-                })
+    # Coverage is decided locally; only borderline scores cost an LLM call
+    matcher = get_matcher()
+    coverage = local_coverage(clauses, regulations)
+
+    borderline = [r for r in coverage if r["status"] == "borderline"]
+    verdicts = {}
+    if borderline and escalate_borderline:
+        try:
+            verdicts = resolve_borderline(borderline, clauses)
+        except RuntimeError as e:
+            # Unresolved borderline requirements are still reported below
+            print(f"⚠ {e}")
+
+    for i, r in enumerate(borderline):
+        verdict = verdicts.get(i)
+        if verdict is not None:
+            r["status"] = "covered" if verdict.get("covered") else "missing"
+            r["llm_reason"] = verdict.get("reason")
+
+    for r in coverage:
+        if r["status"] == "covered":
+            continue
+
+        compliance_issues.append({
+            "regulation": r["regulation"],
+            "issue_type": "missing_clause",
+            "required_clause": r["required_clause"],
+            # Unresolved borderline: possibly covered, so not high
+            "severity": (
+                (matcher.requirement(r["regulation"], r["required_clause"]) or {}).get("severity", "high")
+                if r["status"] == "missing" else "medium"
+            ),
+            "coverage_confidence": r["coverage_confidence"],
+            "best_clause_id": r["best_clause_id"],
+            "explanation": r.get("llm_reason"),
+            "source": "baseline_regulation"
+        })
 
     # -----------------------------------------------------
     # 2. Weak / Risky Clause Detection (from Milestone 2)
@@ -59,31 +198,21 @@ def check_compliance(
             })
 
     # -----------------------------------------------------
-    # 3. Live GDPR Update Awareness
+    # 3. Live Regulatory Update Awareness
     # -----------------------------------------------------
-    if live_gdpr_updates and live_gdpr_updates.get("has_new_updates"):
-        for entry in live_gdpr_updates.get("new_entries", []):
-            compliance_issues.append({
-                "regulation": "GDPR",
-                "issue_type": "regulatory_update",
-                "severity": "medium",
-                "title": entry.get("title"),
-                "summary": entry.get("summary"),
-                "source": "gdpr_live_tracker"
-            })
+    # live_updates: {source_name: result} from feed_tracker.detect_changes()
+    for source_name, updates in (live_updates or {}).items():
+        if not updates.get("has_new_updates"):
+            continue
 
-    # -----------------------------------------------------
-    # 4. Live HIPAA Update Awareness
-    # -----------------------------------------------------
-    if live_hipaa_updates and live_hipaa_updates.get("has_new_updates"):
-        for entry in live_hipaa_updates.get("new_entries", []):
+        for entry in updates.get("new_entries", []):
             compliance_issues.append({
-                "regulation": "HIPAA",
+                "regulation": source_name,
                 "issue_type": "regulatory_update",
                 "severity": "medium",
                 "title": entry.get("title"),
                 "summary": entry.get("summary"),
-                "source": "hipaa_live_tracker"
+                "source": "feed_tracker"
             })
 
     # -----------------------------------------------------
@@ -0,0 +1,186 @@
+# src/regulatory/regulatory_daemon.py
+
+import os
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+
+from src.regulatory.feed_tracker import detect_changes
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+REGULATORY_POLL_INTERVAL = float(os.getenv("REGULATORY_POLL_INTERVAL", "3600"))
+
+# Results older than this are reported as stale
+REGULATORY_STATE_TTL = float(os.getenv("REGULATORY_STATE_TTL", str(2 * REGULATORY_POLL_INTERVAL)))
+
+# Set to 0 when a standalone daemon keeps the state fresh, so pipelines
+# only read it instead of starting their own in-process poller
+REGULATORY_POLLER_ENABLED = os.getenv("REGULATORY_POLLER_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# Shared with a standalone daemon process (python -m src.regulatory.regulatory_daemon)
+REGULATORY_STATE_PATH = Path(os.getenv("REGULATORY_STATE_PATH", "data/cache/regulatory_state.json"))
+
+_lock = threading.Lock()
+_state = None
+_state_mtime = None
+
+_thread = None
+_stop = threading.Event()
+
+
+# =====================================================
+# STATE
+# =====================================================
+def _write_state(state):
+    REGULATORY_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = REGULATORY_STATE_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, REGULATORY_STATE_PATH)
+    return os.stat(REGULATORY_STATE_PATH).st_mtime
+
+
+def _refresh_from_disk():
+    # Picks up polls written by another process; one stat() when unchanged
+    global _state, _state_mtime
+
+    try:
+        mtime = os.stat(REGULATORY_STATE_PATH).st_mtime
+    except OSError:
+        return
+
+    if mtime == _state_mtime:
+        return
+
+    try:
+        with open(REGULATORY_STATE_PATH, "r", encoding="utf-8") as f:
+            _state = json.load(f)
+        _state_mtime = mtime
+    except (OSError, ValueError):
+        pass
+
+
+def poll_once():
+    """
+    Polls every regulator (network) and stores the results with their
+    fetch time. Returns the results.
+    """
+    global _state, _state_mtime
+
+    results = detect_changes()
+    state = {"fetched_at": time.time(), "results": results}
+
+    with _lock:
+        _state = state
+        try:
+            _state_mtime = _write_state(state)
+        except OSError as e:
+            print(f"⚠ Could not persist regulatory state: {e}")
+
+    return results
+
+
+def get_cached_state():
+    """
+    Latest polled results without touching the network. stale is True
+    when nothing has been polled yet or the results are older than
+    REGULATORY_STATE_TTL.
+    """
+    with _lock:
+        _refresh_from_disk()
+        state = _state
+
+    if state is None:
+        return {
+            "fetched_at": None,
+            "age_seconds": None,
+            "ttl_seconds": REGULATORY_STATE_TTL,
+            "stale": True,
+            "results": {}
+        }
+
+    age = time.time() - state["fetched_at"]
+    return {
+        "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(state["fetched_at"])),
+        "age_seconds": round(age, 1),
+        "ttl_seconds": REGULATORY_STATE_TTL,
+        "stale": age > REGULATORY_STATE_TTL,
+        "results": state["results"]
+    }
+
+
+# =====================================================
+# BACKGROUND POLLER
+# =====================================================
+def _loop(interval, on_updates):
+    # A recent poll (possibly by an earlier run) is reused until it is due
+    age = get_cached_state()["age_seconds"]
+    if age is not None and age < interval:
+        _stop.wait(interval - age)
+
+    while not _stop.is_set():
+        try:
+            results = poll_once()
+            if on_updates:
+                on_updates(results)
+        except Exception as e:
+            print(f"⚠ Regulatory poll failed: {e}")
+        _stop.wait(interval)
+
+
+def start_poller(interval=REGULATORY_POLL_INTERVAL, on_updates=None):
+    """
+    Starts the background poller once per process; later calls are no-ops.
+    on_updates(results) runs after every poll, so alerts for a change are
+    sent once rather than once per contract.
+    """
+    global _thread
+
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _stop.clear()
+        _thread = threading.Thread(
+            target=_loop, args=(interval, on_updates), name="regulatory_poller", daemon=True
+        )
+        _thread.start()
+
+
+def stop_poller():
+    _stop.set()
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main():
+    parser = argparse.ArgumentParser(description="Poll regulatory sources on an interval")
+    parser.add_argument("--interval", type=float, default=REGULATORY_POLL_INTERVAL,
+                        help="Seconds between polls")
+    parser.add_argument("--once", action="store_true", help="Poll once and exit")
+    args = parser.parse_args()
+
+    if args.once:
+        print(json.dumps(poll_once(), indent=2))
+        return
+
+    print(f"Polling regulators every {args.interval:.0f}s → {REGULATORY_STATE_PATH}")
+    try:
+        while True:
+            results = poll_once()
+            for name, r in results.items():
+                print(f"{name}:", r.get("message"))
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
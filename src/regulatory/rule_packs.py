@@ -0,0 +1,245 @@
+# src/regulatory/rule_packs.py
+
+import os
+import re
+import json
+import hashlib
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+# One JSON file per regulation:
+# {"regulation", "version", "description",
+#  "required_clauses": [{"name", "severity", "synonyms", "indicators"}]}
+RULE_PACKS_DIR = Path(os.getenv("RULE_PACKS_DIR", str(Path(__file__).parent / "rule_packs")))
+
+RULE_PACK_CACHE_PATH = Path(os.getenv("RULE_PACK_CACHE_PATH", "data/cache/rule_packs.json"))
+
+# Bump whenever the compiled format or the pattern builder changes
+RULE_PACK_COMPILER_VERSION = 1
+
+_lock = threading.Lock()
+_matcher = None
+
+# An indicator in a negated sentence ("is not obligated to notify") is
+# not evidence of coverage. "without undue delay" and "no later than"
+# are obligations, not negations.
+_NEGATION_RE = re.compile(
+    r"\b(?:not|never|cannot|nor|neither)\b|n't\b"
+    r"|\bno\b(?!\s+(?:later|less|more|fewer)\s+than)"
+    r"|\bwithout\b(?!\s+(?:undue\s+)?delay)",
+    re.IGNORECASE
+)
+_SENTENCE_END_RE = re.compile(r"[.;!?]")
+
+
+# =====================================================
+# LOADING
+# =====================================================
+def _pack_files():
+    return sorted(RULE_PACKS_DIR.glob("*.json")) if RULE_PACKS_DIR.exists() else []
+
+
+def _fingerprint(files):
+    digest = hashlib.sha256(f"v{RULE_PACK_COMPILER_VERSION}".encode("utf-8"))
+    for path in files:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _normalize_phrase(text):
+    return re.sub(r"\s+", " ", text.lower()).strip()
+
+
+# =====================================================
+# COMPILATION
+# =====================================================
+def _trie_pattern(phrases):
+    """
+    Word-level trie of all indicator phrases rendered as one regex, so
+    shared prefixes ("data processing agreement" / "data processing
+    addendum") are matched once however many packs use them.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for word in phrase.split(" "):
+            node = node.setdefault(word, {})
+        node[""] = {}
+
+    def render(node):
+        branches = []
+        for word in sorted((w for w in node if w), key=len, reverse=True):
+            child = node[word]
+            tail = render(child) if any(child) else ""
+            if tail:
+                tail = rf"\s+{tail}"
+                if "" in child:
+                    tail = f"(?:{tail})?"
+            branches.append(re.escape(word) + tail)
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return rf"(?<!\w){render(trie)}(?!\w)" if trie else r"(?!x)x"
+
+
+def compile_packs(packs):
+    """
+    Merges every pack into one compiled form: a single trie regex over all
+    indicator phrases, and a table from phrase to the (regulation, clause)
+    requirements it satisfies.
+    """
+    regulations = {}
+    phrase_targets = {}
+
+    for pack in packs:
+        name = pack["regulation"]
+        regulations[name] = {
+            "version": pack.get("version"),
+            "description": pack.get("description"),
+            "required_clauses": []
+        }
+
+        for clause in pack.get("required_clauses", []):
+            regulations[name]["required_clauses"].append({
+                "name": clause["name"],
+                "severity": clause.get("severity", "high"),
+                "synonyms": clause.get("synonyms", [])
+            })
+            for phrase in clause.get("indicators", []):
+                targets = phrase_targets.setdefault(_normalize_phrase(phrase), [])
+                if [name, clause["name"]] not in targets:
+                    targets.append([name, clause["name"]])
+
+    return {
+        "compiler_version": RULE_PACK_COMPILER_VERSION,
+        "pattern": _trie_pattern(phrase_targets),
+        "phrases": phrase_targets,
+        "regulations": regulations
+    }
+
+
+def _load_compiled():
+    files = _pack_files()
+    fingerprint = _fingerprint(files)
+
+    try:
+        with open(RULE_PACK_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("fingerprint") == fingerprint:
+            return cached
+    except (OSError, ValueError):
+        pass
+
+    packs = []
+    for path in files:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                packs.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"⚠ Skipping rule pack {path.name}: {e}")
+
+    compiled = compile_packs(packs)
+    compiled["fingerprint"] = fingerprint
+
+    try:
+        RULE_PACK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(RULE_PACK_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(compiled, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"⚠ Could not write rule pack cache: {e}")
+
+    return compiled
+
+
+# =====================================================
+# MATCHER
+# =====================================================
+class RulePackMatcher:
+    """
+    Shared matcher over all loaded packs. One regex pass per clause finds
+    indicators for every regulation at once, so the cost does not grow
+    with the number of regulations checked.
+    """
+
+    def __init__(self, compiled):
+        self.version = compiled.get("fingerprint", "")[:12]
+        self.regulations = compiled["regulations"]
+        self._phrases = compiled["phrases"]
+        # Zero-width lookahead, so the longest phrase starting at every
+        # word is found even inside a longer match ("information security
+        # incident" still yields "security incident")
+        self._regex = re.compile(f"(?=({compiled['pattern']}))", re.IGNORECASE)
+        self._clauses = {
+            (reg, c["name"]): c
+            for reg, spec in self.regulations.items()
+            for c in spec["required_clauses"]
+        }
+
+    def requirement(self, regulation, required_clause):
+        return self._clauses.get((regulation, required_clause))
+
+    def find_requirements(self, clauses):
+        """
+        {(regulation, required_clause): [clause_id, ...]} for every
+        requirement with an indicator phrase in the body of at least one
+        clause. Overlapping and nested phrases all count; phrases in a
+        negated sentence do not. Headings are ignored, since a heading
+        names a topic without saying how it is handled.
+        """
+        found = {}
+        for clause in clauses:
+            text = clause.get("clause_text") or ""
+            heading = (clause.get("clause_heading") or "").strip().lower()
+            first_line, _, rest = text.partition("\n")
+            if heading and heading in first_line.lower():
+                text = rest
+            for m in self._regex.finditer(text):
+                if negated(text, m.start(1), m.end(1)):
+                    continue
+                # Shorter phrases starting at the same word ("incident
+                # response" within "incident response plan")
+                words = _normalize_phrase(m.group(1)).split(" ")
+                for n in range(1, len(words) + 1):
+                    for reg, name in self._phrases.get(" ".join(words[:n]), []):
+                        ids = found.setdefault((reg, name), [])
+                        if clause.get("clause_id") not in ids:
+                            ids.append(clause.get("clause_id"))
+        return found
+
+
+def negated(text, start=0, end=None):
+    """
+    True if the sentence(s) around text[start:end] contain a negation.
+    With no span, checks the whole text.
+    """
+    end = len(text) if end is None else end
+    ends = [e.end() for e in _SENTENCE_END_RE.finditer(text, 0, start)]
+    sentence_start = ends[-1] if ends else 0
+    after = _SENTENCE_END_RE.search(text, end)
+    sentence_end = after.start() if after else len(text)
+    return bool(_NEGATION_RE.search(text, sentence_start, sentence_end))
+
+
+def get_matcher():
+    global _matcher
+
+    with _lock:
+        if _matcher is None:
+            _matcher = RulePackMatcher(_load_compiled())
+        return _matcher
+
+
+def pack_regulations():
+    """
+    Regulations defined by rule packs, in load_regulations() shape.
+    """
+    return {
+        name: {"required_clauses": [c["name"] for c in spec["required_clauses"]]}
+        for name, spec in get_matcher().regulations.items()
+    }
@@ -0,0 +1,232 @@
+# src/risk_engine/risk_cache.py
+
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+import numpy as np
+from pathlib import Path
+from dotenv import load_dotenv
+
+from src.clause_engine.clause_dedup import minhash_signature, similarity, lsh_bands, meaning_key
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+RISK_CACHE_PATH = Path(os.getenv("RISK_CACHE_PATH", "data/cache/risk_cache.sqlite3"))
+
+# Set RISK_CACHE_DISABLED=1 to assess every clause from scratch
+RISK_CACHE_DISABLED = os.getenv("RISK_CACHE_DISABLED", "0").lower() in ("1", "true", "yes")
+
+# Estimated Jaccard similarity (after normalisation) needed to reuse a
+# result; numbers and negation words must also match exactly
+RISK_CACHE_THRESHOLD = float(os.getenv("RISK_CACHE_THRESHOLD", "0.9"))
+
+_lock = threading.Lock()
+_conn = None
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "writes": 0
+}
+
+# =====================================================
+# NORMALISATION
+# =====================================================
+# Copies of the same boilerplate differ in numbering, party names and
+# whitespace; none of that should stop a match. Figures (notice periods,
+# caps) are kept because they change the risk.
+_PARTY_ROLES = (
+    "provider", "service provider", "customer", "client", "supplier", "vendor",
+    "licensor", "licensee", "contractor", "company", "disclosing party",
+    "receiving party", "processor", "controller", "buyer", "seller"
+)
+_PARTY_ROLE_RE = re.compile(
+    r"\b(?:the\s+)?(?:" + "|".join(sorted(map(re.escape, _PARTY_ROLES), key=len, reverse=True)) + r")s?\b",
+    re.IGNORECASE
+)
+_COMPANY_RE = re.compile(
+    r"\b(?:[A-Z][\w&.-]*\s+){1,4}(?:Inc|LLC|LLP|Ltd|Limited|Corp|Corporation|GmbH|PLC|Pvt)\b\.?"
+)
+_NUMBERING_RE = re.compile(r"^\s*\d+(?:\.\d+)*\.?\s+")
+
+
+def normalize_clause(text):
+    text = _NUMBERING_RE.sub("", text or "")
+    text = _COMPANY_RE.sub(" party ", text)
+    text = _PARTY_ROLE_RE.sub(" party ", text)
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+# =====================================================
+# STORAGE
+# =====================================================
+def _get_conn():
+    global _conn
+
+    if _conn is None:
+        RISK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(str(RISK_CACHE_PATH), check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS risk_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                signature BLOB NOT NULL,
+                normalized_text TEXT NOT NULL,
+                risk TEXT NOT NULL,
+                contract_id TEXT,
+                clause_id TEXT,
+                created_at REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS risk_cache_bands (
+                band INTEGER NOT NULL,
+                bucket BLOB NOT NULL,
+                entry_id INTEGER NOT NULL
+            )
+        """)
+        _conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_risk_cache_bands ON risk_cache_bands(band, bucket)"
+        )
+        _conn.commit()
+
+    return _conn
+
+
+def _best_match(conn, signature, meaning):
+    candidates = set()
+    for band, bucket in lsh_bands(signature):
+        rows = conn.execute(
+            "SELECT entry_id FROM risk_cache_bands WHERE band = ? AND bucket = ?",
+            (band, bucket)
+        ).fetchall()
+        candidates.update(r[0] for r in rows)
+
+    best, best_score = None, RISK_CACHE_THRESHOLD
+    for entry_id in candidates:
+        row = conn.execute(
+            "SELECT id, signature, risk, contract_id, clause_id, created_at, normalized_text "
+            "FROM risk_cache WHERE id = ?",
+            (entry_id,)
+        ).fetchone()
+        if row is None or meaning_key(row[6]) != meaning:
+            continue
+
+        score = similarity(signature, np.frombuffer(row[1], dtype=np.uint64))
+        if score >= best_score:
+            best, best_score = row, score
+
+    return best, best_score
+
+
+# =====================================================
+# LOOKUP / STORE
+# =====================================================
+def lookup(clause_text):
+    """
+    Returns a copy of the risk previously assessed for a near-identical
+    clause with the same figures and negations, with provenance under
+    "reused_from", or None.
+    """
+    if RISK_CACHE_DISABLED:
+        return None
+
+    normalized = normalize_clause(clause_text)
+    signature = minhash_signature(normalized)
+    if signature is None:
+        return None
+
+    with _lock:
+        conn = _get_conn()
+        row, score = _best_match(conn, signature, meaning_key(normalized))
+
+        if row is None:
+            _stats["misses"] += 1
+            return None
+
+        entry_id, _, risk_json, contract_id, clause_id, created_at, _ = row
+        conn.execute("UPDATE risk_cache SET hits = hits + 1 WHERE id = ?", (entry_id,))
+        conn.commit()
+        _stats["hits"] += 1
+
+    risk = json.loads(risk_json)
+    risk["reused_from"] = {
+        "contract_id": contract_id,
+        "clause_id": clause_id,
+        "similarity": round(score, 3),
+        "assessed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created_at))
+    }
+    return risk
+
+
+def store(clause_text, risk, contract_id=None, clause_id=None):
+    if RISK_CACHE_DISABLED or not isinstance(risk, dict):
+        return
+
+    normalized = normalize_clause(clause_text)
+    signature = minhash_signature(normalized)
+    if signature is None:
+        return
+
+    risk = {k: v for k, v in risk.items() if k != "reused_from"}
+
+    with _lock:
+        conn = _get_conn()
+
+        # One entry per family of near-identical clauses is enough
+        row, _ = _best_match(conn, signature, meaning_key(normalized))
+        if row is not None:
+            return
+
+        cur = conn.execute(
+            """
+            INSERT INTO risk_cache
+                (signature, normalized_text, risk, contract_id, clause_id, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                signature.tobytes(),
+                normalized,
+                json.dumps(risk, ensure_ascii=False),
+                contract_id,
+                None if clause_id is None else str(clause_id),
+                time.time()
+            )
+        )
+        conn.executemany(
+            "INSERT INTO risk_cache_bands (band, bucket, entry_id) VALUES (?, ?, ?)",
+            [(band, bucket, cur.lastrowid) for band, bucket in lsh_bands(signature)]
+        )
+        conn.commit()
+        _stats["writes"] += 1
+
+
+def clear():
+    with _lock:
+        conn = _get_conn()
+        conn.execute("DELETE FROM risk_cache_bands")
+        conn.execute("DELETE FROM risk_cache")
+        conn.commit()
+
+
+# =====================================================
+# STATS
+# =====================================================
+def risk_cache_stats():
+    with _lock:
+        stats = dict(_stats)
+        conn = _get_conn()
+        entries = conn.execute("SELECT COUNT(*) FROM risk_cache").fetchone()[0]
+
+    lookups = stats["hits"] + stats["misses"]
+    stats["entries"] = entries
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    stats["enabled"] = not RISK_CACHE_DISABLED
+    return stats
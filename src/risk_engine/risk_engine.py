@@ -1,12 +1,36 @@
 # src/risk_engine/risk_engine.py
 
+import os
 import json
+import time
+import queue
+import threading
+from concurrent.futures import as_completed
 from dotenv import load_dotenv
 
 from src.llm.llm_router import chat_completion_json
+from src.utils.cleaner import count_tokens
+from src.risk_engine.risk_rules import evaluate_rules, RISK_RULES_ENABLED
+from src.risk_engine import risk_cache
+from src.risk_engine.risk_scheduler import PriorityExecutor, risk_prior, RISK_PRIORITIZE
 
 load_dotenv()
 
+# Clauses (or batches of clauses) assessed in parallel
+RISK_MAX_WORKERS = int(os.getenv("RISK_MAX_WORKERS", "4"))
+
+# Clause-text token budget per batched risk prompt (0 = one call per clause)
+RISK_BATCH_TOKENS = int(os.getenv("RISK_BATCH_TOKENS", "4000"))
+# Caps the size of the JSON answer for a batch
+RISK_BATCH_MAX_CLAUSES = int(os.getenv("RISK_BATCH_MAX_CLAUSES", "10"))
+
+# Streaming only: a partial batch is sent once no clause has arrived for
+# RISK_STREAM_STALL_SECONDS, or once it has been open RISK_STREAM_MAX_WAIT
+RISK_STREAM_STALL_SECONDS = float(os.getenv("RISK_STREAM_STALL_SECONDS", "0.5"))
+RISK_STREAM_MAX_WAIT = float(os.getenv("RISK_STREAM_MAX_WAIT", "2.0"))
+
+RISK_LEVELS = ["low", "medium", "high"]
+
 # =====================================================
 # PROMPTS (UNCHANGED)
 # =====================================================
@@ -42,6 +66,23 @@ Evaluate the legal and regulatory risk of the following clause:
 Return ONLY the JSON object described in the system prompt.
 """
 
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT.replace(
+    "You MUST output ONLY valid JSON in the following structure:",
+    "You will receive several clauses, each with a clause_id.\n"
+    "You MUST output ONLY a valid JSON array with one object per clause,\n"
+    "each containing \"clause_id\" (exactly as given) and the following fields:"
+)
+
+BATCH_USER_PROMPT_TEMPLATE = """
+Evaluate the legal and regulatory risk of each of the following clauses independently:
+
+<CLAUSES>
+{clauses}
+</CLAUSES>
+
+Return ONLY the JSON array described in the system prompt, one object per clause_id.
+"""
+
 # =====================================================
 # CORE LLM CALL (REFactored)
 # =====================================================
@@ -54,11 +95,15 @@ def assess_clause_with_llm(clause_text: str):
         temperature=0.0
     )
 
+    return _standardize_risk(risk)
+
+
+def _standardize_risk(risk):
     # Standardize on "severity" for downstream pipeline
     if isinstance(risk, dict):
         risk_level = risk.get("risk_level")
 
-        if risk_level in ["low", "medium", "high"]:
+        if risk_level in RISK_LEVELS:
             risk["severity"] = risk_level
         else:
             risk["severity"] = "medium"  # safe fallback
@@ -69,29 +114,329 @@ def assess_clause_with_llm(clause_text: str):
     return risk
 
 
+# =====================================================
+# BATCHED LLM CALL
+# =====================================================
+def _is_valid_risk(item):
+    return (
+        isinstance(item, dict)
+        and isinstance(item.get("risk_level"), str)
+        and item["risk_level"].lower() in RISK_LEVELS
+        and isinstance(item.get("explanation"), str)
+    )
+
+
+def assess_clause_batch(clauses):
+    """
+    Assesses several clauses with one LLM call. The answer is validated
+    per clause_id; any clause missing from it (or with an unusable
+    entry) is retried on its own. Attaches "risk" to each clause in place
+    and returns the clauses.
+    """
+    if len(clauses) == 1:
+        clauses[0]["risk"] = assess_clause_with_llm(clauses[0].get("clause_text", ""))
+        return clauses
+
+    payload = [
+        {"clause_id": str(c.get("clause_id")), "clause_text": c.get("clause_text", "")}
+        for c in clauses
+    ]
+
+    response = chat_completion_json(
+        system_prompt=BATCH_SYSTEM_PROMPT,
+        user_prompt=BATCH_USER_PROMPT_TEMPLATE.format(
+            clauses=json.dumps(payload, ensure_ascii=False)
+        ),
+        temperature=0.0
+    )
+
+    answers = {}
+    for item in response.get("data", []):
+        if isinstance(item, dict) and item.get("clause_id") is not None:
+            answers[str(item.pop("clause_id"))] = item
+
+    for c in clauses:
+        item = answers.get(str(c.get("clause_id")))
+
+        if _is_valid_risk(item):
+            item["risk_level"] = item["risk_level"].lower()
+            item["_llm_used"] = response["_llm_used"]
+            c["risk"] = _standardize_risk(item)
+        else:
+            print(f"⚠ Clause {c.get('clause_id')} missing from batched answer; retrying on its own")
+            c["risk"] = assess_clause_with_llm(c.get("clause_text", ""))
+
+    return clauses
+
+
+def _batch_full(batch, ids, size, cid, tokens, max_tokens):
+    return bool(batch) and (
+        size + tokens > max_tokens
+        or cid in ids
+        or len(batch) >= RISK_BATCH_MAX_CLAUSES
+    )
+
+
+def _risk_batches(clauses, max_tokens):
+    """
+    Groups an iterable of clauses into batches of at most max_tokens
+    clause-text tokens. Clause ids stay unique within a batch so the
+    answer can be matched back.
+    """
+    batch, ids, size = [], set(), 0
+
+    for c in clauses:
+        tokens = count_tokens(c.get("clause_text", ""))
+        cid = str(c.get("clause_id"))
+
+        if _batch_full(batch, ids, size, cid, tokens, max_tokens):
+            yield batch
+            batch, ids, size = [], set(), 0
+
+        batch.append(c)
+        ids.add(cid)
+        size += tokens
+
+    if batch:
+        yield batch
+
+
 # =====================================================
 # BATCH RISK ASSESSMENT (UNCHANGED API)
 # =====================================================
-def assess_clauses(clauses):
+def _failed_risk(error):
+    return _standardize_risk({
+        "risk_level": "UNKNOWN",
+        "explanation": "Risk assessment failed. Manual review required.",
+        "error": str(error),
+        "_llm_used": "none"
+    })
+
+
+def _assess_unit(batch, contract_id=None):
     """
-    clauses → list of clause dicts from clause_extractor
-    Attaches LLM risk output to each clause
+    Worker body: assesses one clause or one batch. A failure is recorded
+    on the affected clauses instead of aborting the whole run. Valid LLM
+    results are added to the cross-contract risk cache.
     """
-    assessed = []
+    try:
+        assess_clause_batch(batch)
+    except Exception as e:
+        print(f"⚠ Risk assessment failed for {', '.join(str(c.get('clause_id')) for c in batch)}:", e)
+        for c in batch:
+            c["risk"] = _failed_risk(e)
+        return batch
+
+    for c in batch:
+        risk = c.get("risk")
+        if _is_valid_risk(risk) and risk.get("_llm_used") not in ("none", "rules"):
+            risk_cache.store(c.get("clause_text", ""), risk, contract_id, c.get("clause_id"))
+
+    return batch
+
 
+def _decide_locally(c, use_rules):
+    """
+    Fast paths: clear-cut clauses get deterministic risk from the rule
+    engine, and near-copies of clauses assessed before (in any contract)
+    reuse that result from the risk cache. Returns True if the clause
+    was decided without the LLM.
+    """
+    text = c.get("clause_text", "")
+
+    risk = evaluate_rules(text) if use_rules else None
+    if risk is None:
+        risk = risk_cache.lookup(text)
+
+    if risk is None:
+        return False
+
+    c["risk"] = _standardize_risk(risk)
+    return True
+
+
+def _triage(clauses, decided, use_rules):
+    """
+    Locally decided clauses are appended to `decided`; only the
+    remaining clauses are yielded on to the LLM.
+    """
     for c in clauses:
-        text = c.get("clause_text", "")
-        clause_id = c.get("clause_id")
+        if _decide_locally(c, use_rules):
+            decided.append(c)
+            continue
+
+        yield c
+
+
+def _units(clauses, batch_tokens):
+    if batch_tokens > 0:
+        return _risk_batches(clauses, batch_tokens)
+    return ([c] for c in clauses)
+
+
+def _submit(pool, batch, contract_id, prioritize):
+    print(f"\nEvaluating risk for clause: {', '.join(str(c.get('clause_id')) for c in batch)} ...")
+    priority = max(risk_prior(c) for c in batch) if prioritize else 0
+    return pool.submit(priority, _assess_unit, batch, contract_id)
+
+
+def assess_clauses(clauses, max_workers=RISK_MAX_WORKERS, batch_tokens=RISK_BATCH_TOKENS,
+                   on_clause_done=None, use_rules=RISK_RULES_ENABLED, contract_id=None,
+                   on_result=None, prioritize=RISK_PRIORITIZE):
+    """
+    clauses → list of clause dicts from clause_extractor
+    Attaches LLM risk output to each clause and returns them in input
+    order. Clauses (or batches of clauses, when batch_tokens > 0) are
+    assessed on a bounded worker pool; every call still goes through the
+    router's rate limiter. With use_rules, clear-cut clauses are decided
+    by the rule engine and never reach the LLM. contract_id is recorded
+    as provenance in the risk cache.
+
+    With prioritize, LLM work is ordered by risk_prior (clause_type and
+    keyword signals) so likely high-risk clauses finish first. Results
+    are published as they complete, from the calling thread:
+    on_result(clause) with its risk attached, and
+    on_clause_done(done, total, clause_id) for progress.
+    """
+    clauses = list(clauses)
+    decided = []
+    done = 0
+
+    def _publish(c):
+        nonlocal done
+        done += 1
+        if on_result:
+            on_result(c)
+        if on_clause_done:
+            on_clause_done(done, len(clauses), c.get("clause_id"))
+
+    ordered = sorted(clauses, key=risk_prior, reverse=True) if prioritize else clauses
+
+    with PriorityExecutor(max_workers, thread_name_prefix="risk") as pool:
+        futures = [
+            _submit(pool, batch, contract_id, prioritize)
+            for batch in _units(_triage(ordered, decided, use_rules), batch_tokens)
+        ]
+
+        for c in decided:
+            _publish(c)
+
+        for future in as_completed(futures):
+            for c in future.result():
+                _publish(c)
+
+    # Risk is attached in place, so input order is preserved as-is
+    return clauses
+
+
+# =====================================================
+# STREAMING RISK ASSESSMENT
+# =====================================================
+def _read_stream(clause_stream, events):
+    # Runs on its own thread so the caller can notice when input stalls
+    try:
+        for c in clause_stream:
+            events.put(("clause", c))
+    except Exception as e:
+        events.put(("error", e))
+        return
+    events.put(("end", None))
+
+
+def assess_clauses_stream(clause_stream, max_workers=RISK_MAX_WORKERS, batch_tokens=RISK_BATCH_TOKENS,
+                          use_rules=RISK_RULES_ENABLED, contract_id=None,
+                          on_result=None, prioritize=RISK_PRIORITIZE):
+    """
+    clause_stream → iterable yielding clause dicts (e.g. extract_clauses_stream)
+    Starts assessing each clause (or batch of clauses, when batch_tokens
+    > 0) as soon as it arrives instead of waiting for extraction to
+    finish. A partial batch is sent when the stream stalls for
+    RISK_STREAM_STALL_SECONDS or has been open RISK_STREAM_MAX_WAIT, so
+    slow extraction never holds clauses back. Queued work is ordered by
+    risk_prior when prioritize is set.
+
+    on_result(clause) is called from the calling thread for every
+    finished clause: immediately for rule / risk-cache decisions, and as
+    soon as its LLM batch completes otherwise. Returns clauses in
+    arrival order.
+    """
+    arrived = []
+    pending = set()
+    events = queue.Queue()
+    stream_done = False
+
+    batch, ids, size = [], set(), 0
+    opened_at = last_arrival = None
+
+    def _publish(c):
+        if on_result:
+            on_result(c)
+
+    def _flush():
+        nonlocal batch, ids, size
+        if not batch:
+            return
+        future = _submit(pool, batch, contract_id, prioritize)
+        pending.add(future)
+        future.add_done_callback(lambda f: events.put(("done", f)))
+        batch, ids, size = [], set(), 0
+
+    reader = threading.Thread(
+        target=_read_stream, args=(clause_stream, events), name="risk_stream_reader", daemon=True
+    )
+
+    with PriorityExecutor(max_workers, thread_name_prefix="risk") as pool:
+        reader.start()
+
+        while not stream_done or pending or batch:
+            timeout = None
+            if batch:
+                deadline = min(last_arrival + RISK_STREAM_STALL_SECONDS, opened_at + RISK_STREAM_MAX_WAIT)
+                timeout = max(0.0, deadline - time.monotonic())
+
+            try:
+                kind, item = events.get(timeout=timeout)
+            except queue.Empty:
+                _flush()
+                continue
+
+            if kind == "clause":
+                arrived.append(item)
+                last_arrival = time.monotonic()
+
+                if _decide_locally(item, use_rules):
+                    _publish(item)
+                    continue
+
+                if batch_tokens <= 0:
+                    batch = [item]
+                    _flush()
+                    continue
+
+                tokens = count_tokens(item.get("clause_text", ""))
+                cid = str(item.get("clause_id"))
+                if _batch_full(batch, ids, size, cid, tokens, batch_tokens):
+                    _flush()
+                if not batch:
+                    opened_at = last_arrival
+                batch.append(item)
+                ids.add(cid)
+                size += tokens
 
-        print(f"\nEvaluating risk for clause: {clause_id} ...")
+            elif kind == "done":
+                pending.discard(item)
+                for c in item.result():
+                    _publish(c)
 
-        risk = assess_clause_with_llm(text)
+            elif kind == "end":
+                stream_done = True
+                _flush()
 
-        # Attach risk + audit metadata
-        c["risk"] = risk
-        assessed.append(c)
+            else:
+                raise item
 
-    return assessed
+    # Risk is attached in place (by the rules or a worker)
+    return arrived
 
 
 # =====================================================
@@ -0,0 +1,249 @@
+# src/risk_engine/risk_rules.py
+
+import os
+import re
+import threading
+from collections import Counter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+RISK_RULES_ENABLED = os.getenv("RISK_RULES_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# Boilerplate longer than this may hide something else → let the LLM read it
+RISK_RULES_BOILERPLATE_MAX_CHARS = int(os.getenv("RISK_RULES_BOILERPLATE_MAX_CHARS", "800"))
+
+# =====================================================
+# RULES
+# =====================================================
+# category:
+#   high       → clear-cut risk indicator; decides "high" on its own
+#   sensitive  → subject matter that needs judgement; always goes to the LLM
+#   low        → standard boilerplate; decides "low" when nothing else fires
+RULES = [
+    # ---- high ----
+    {
+        "id": "unlimited_liability",
+        "category": "high",
+        "pattern": r"\bunlimited liability\b"
+                   r"|\bliability\s+(?:shall|will)\s+(?:be\s+)?unlimited\b"
+                   r"|\bwithout\s+(?:any\s+)?limit(?:ation)?\s+(?:of|on|to)\s+(?:its\s+|their\s+)?liability\b",
+        "factor": "Unlimited liability exposure",
+        "missing_control": "Liability cap",
+        "regulations": ["General Contract Law"],
+        "negatable": True
+    },
+    {
+        "id": "indefinite_retention",
+        "category": "high",
+        "pattern": r"\b(?:retain|retained|store|stored|keep|kept)\b.{0,80}?"
+                   r"\b(?:indefinitely|(?:for\s+an\s+)?indefinite\s+period|in perpetuity|"
+                   r"(?:for\s+an\s+)?unlimited\s+period|without (?:any )?time limit)\b",
+        "factor": "Indefinite data retention",
+        "missing_control": "Retention period and deletion obligation",
+        "regulations": ["GDPR"],
+        "negatable": True
+    },
+    {
+        "id": "phi_disclosure",
+        "category": "high",
+        "pattern": r"\b(?:disclose|disclosed|share|shared|sell|sold|transfer|transferred)\b.{0,80}?"
+                   r"\b(?:protected health information|PHI|medical records|health data)\b.{0,80}?"
+                   r"(?:\bwithout\s+(?:the\s+)?(?:patient'?s?\s+)?(?:prior\s+)?(?:written\s+)?(?:consent|authori[sz]ation)"
+                   r"|\bfor\s+(?:marketing|commercial|advertising)\s+purposes)",
+        "factor": "Disclosure of PHI without authorisation",
+        "missing_control": "HIPAA authorisation and minimum-necessary safeguards",
+        "regulations": ["HIPAA"],
+        "negatable": True
+    },
+    {
+        "id": "sale_of_personal_data",
+        "category": "high",
+        "pattern": r"\b(?:sell|sold|rent|rented|monetize|monetise)\b.{0,60}?\bpersonal\s+(?:data|information)\b",
+        "factor": "Sale of personal data",
+        "missing_control": "Lawful basis and data subject consent",
+        "regulations": ["GDPR"],
+        "negatable": True
+    },
+    {
+        "id": "no_breach_notice",
+        "category": "high",
+        "pattern": r"\b(?:no\s+obligation\s+to|not\s+(?:be\s+)?(?:required|obliged|obligated)\s+to|shall\s+not|need\s+not)\s+"
+                   r"(?:notify|inform|report|disclose)\b.{0,80}?\b(?:breach|security incident|data incident)\b"
+                   r"|\b(?:breach|security incident|data incident)\b.{0,80}?"
+                   r"\b(?:no\s+obligation\s+to|not\s+(?:be\s+)?(?:required|obliged|obligated)\s+to|need\s+not)\s+"
+                   r"(?:notify|inform|report)\b"
+                   r"|\bwithout\s+(?:any\s+)?(?:notice|notification)\b.{0,40}?\b(?:breach|security incident)\b",
+        "factor": "No breach notification obligation",
+        "missing_control": "Breach notification within a fixed deadline",
+        "regulations": ["GDPR", "HIPAA"],
+        "negatable": False
+    },
+    {
+        "id": "excludes_gross_negligence",
+        "category": "high",
+        "pattern": r"\bnot\s+(?:be\s+)?liable\b.{0,60}?\b(?:even\s+(?:in\s+(?:the\s+)?case\s+of|for)|including)\s+"
+                   r"(?:its\s+own\s+)?(?:gross negligence|wil(?:l)?ful misconduct|fraud)\b",
+        "factor": "Liability excluded even for gross negligence or fraud",
+        "missing_control": "Carve-out for gross negligence, wilful misconduct and fraud",
+        "regulations": ["General Contract Law"],
+        "negatable": False
+    },
+
+    # ---- sensitive ----
+    {
+        "id": "sensitive_subject",
+        "category": "sensitive",
+        "pattern": r"\b(?:personal\s+(?:data|information)|health|PHI|liab\w*|indemn\w*|confidential\w*|"
+                   r"security|breach\w*|terminat\w*|data|intellectual property|licen[cs]\w*|"
+                   r"fees?|payment|penalt\w*|audit\w*|sub-?processor\w*|transfer\w*|warrant\w*)\b"
+    },
+
+    # ---- low ----
+    {"id": "definitions", "category": "low",
+     "pattern": r"\bwords\s+and\s+expressions\b|[“\"][^”\"\n]{1,60}[”\"]\s+(?:means|shall\s+mean)\b"},
+    {"id": "governing_law", "category": "low",
+     "pattern": r"\bgoverned\s+by\b.{0,60}?\blaws?\s+of\b|^\s*(?:\d+(?:\.\d+)*\.?\s+)?governing\s+law\b"},
+    {"id": "arbitration", "category": "low",
+     "pattern": r"\b(?:settled|resolved|referred)\s+(?:\w+\s+){0,3}?(?:by|to)\s+arbitration\b|\barbitration\s+in\b"},
+    {"id": "assignment_consent", "category": "low",
+     "pattern": r"\bassign\w*\b.{0,60}?\b(?:requires?|without|with)\s+(?:the\s+)?(?:prior\s+)?(?:written\s+)?consent\b"},
+    {"id": "counterparts", "category": "low",
+     "pattern": r"\bexecuted\s+in\s+(?:any\s+number\s+of\s+)?(?:one\s+or\s+more\s+)?counterparts\b"},
+    {"id": "entire_agreement", "category": "low",
+     "pattern": r"\bentire\s+(?:agreement|understanding)\b|\bsupersedes\s+all\s+prior\b"},
+    {"id": "severability", "category": "low",
+     "pattern": r"\b(?:held|found|deemed|determined)\s+(?:by\s+a\s+court\s+)?(?:to\s+be\s+)?(?:invalid|illegal|unenforceable)\b"},
+    {"id": "notices", "category": "low",
+     "pattern": r"\bnotices?\b.{0,60}?\bshall\s+be\s+(?:given\s+|made\s+|sent\s+)?in\s+writing\b"},
+    {"id": "headings", "category": "low",
+     "pattern": r"\bheadings\b.{0,40}?\bfor\s+(?:reference|convenience)\b"},
+    {"id": "waiver", "category": "low",
+     "pattern": r"\bfailure\b.{0,40}?\bto\s+(?:exercise|enforce)\b.{0,80}?\bwaiver\b"},
+    {"id": "relationship", "category": "low",
+     "pattern": r"\bindependent\s+contractors?\b"},
+    {"id": "amendments_in_writing", "category": "low",
+     "pattern": r"\b(?:amended|modified|varied)\s+(?:only\s+)?by\s+(?:a\s+)?(?:written|writing)\b"
+                r"|\bamendments?\s+(?:must|shall)\s+be\s+(?:made\s+)?(?:in\s+)?(?:written|writing)\b"},
+]
+
+_RULES_BY_ID = {r["id"]: r for r in RULES}
+
+# One combined automaton: a single left-to-right pass finds every rule
+_AUTOMATON = re.compile(
+    "|".join(f"(?P<{r['id']}>{r['pattern']})" for r in RULES),
+    re.IGNORECASE | re.DOTALL | re.MULTILINE
+)
+
+# A qualifier anywhere in the clause makes a "high" indicator a judgement call
+_MITIGATOR_RE = re.compile(
+    r"\b(?:except|unless|save\s+for|subject\s+to|provided\s+that|other\s+than)\b",
+    re.IGNORECASE
+)
+# Low-rule matches span text, so re-check the few boilerplate candidates
+# for sensitive terms the combined pass may have consumed
+_SENSITIVE_RE = re.compile(_RULES_BY_ID["sensitive_subject"]["pattern"], re.IGNORECASE)
+_NEGATION_RE = re.compile(r"\b(?:not|no|never|neither|nor)\b[^.;]{0,25}$", re.IGNORECASE)
+
+_lock = threading.Lock()
+_stats = Counter()
+
+
+# =====================================================
+# SCAN
+# =====================================================
+def scan(text):
+    """
+    Returns the ids of all rules that fire on the text, in order of
+    first appearance. Negated indicators ("shall not have unlimited
+    liability") are dropped.
+    """
+    hits = []
+    for m in _AUTOMATON.finditer(text or ""):
+        rule = _RULES_BY_ID[m.lastgroup]
+        if rule.get("negatable") and _NEGATION_RE.search(text[max(0, m.start() - 30):m.start()]):
+            continue
+        if rule["id"] not in hits:
+            hits.append(rule["id"])
+    return hits
+
+
+def evaluate_rules(clause_text):
+    """
+    Deterministic risk for clear-cut clauses, in the same shape the LLM
+    returns, or None when the clause needs LLM judgement.
+    """
+    hits = scan(clause_text)
+    by_category = {"high": [], "sensitive": [], "low": []}
+    for rule_id in hits:
+        by_category[_RULES_BY_ID[rule_id]["category"]].append(_RULES_BY_ID[rule_id])
+
+    high = by_category["high"]
+
+    if high and not _MITIGATOR_RE.search(clause_text):
+        regulations = []
+        for r in high:
+            regulations.extend(x for x in r["regulations"] if x not in regulations)
+
+        risk = {
+            "risk_level": "high",
+            "risk_score": min(100, 80 + 5 * len(high)),
+            "risk_factors": [r["factor"] for r in high],
+            "missing_controls": [r["missing_control"] for r in high],
+            "regulation_violations": regulations,
+            "explanation": "Rule engine: " + "; ".join(r["factor"] for r in high) + ".",
+            "rule_ids": [r["id"] for r in high],
+            "_llm_used": "rules"
+        }
+        _count("high")
+        return risk
+
+    if (
+        not high
+        and not by_category["sensitive"]
+        and by_category["low"]
+        and len(clause_text) <= RISK_RULES_BOILERPLATE_MAX_CHARS
+        and not _SENSITIVE_RE.search(clause_text)
+    ):
+        low = by_category["low"]
+        risk = {
+            "risk_level": "low",
+            "risk_score": 10,
+            "risk_factors": [],
+            "missing_controls": [],
+            "regulation_violations": [],
+            "explanation": "Rule engine: standard boilerplate (" + ", ".join(r["id"] for r in low) + ").",
+            "rule_ids": [r["id"] for r in low],
+            "_llm_used": "rules"
+        }
+        _count("low")
+        return risk
+
+    _count("llm")
+    return None
+
+
+# =====================================================
+# STATS
+# =====================================================
+def _count(outcome):
+    with _lock:
+        _stats[outcome] += 1
+
+
+def rule_stats():
+    with _lock:
+        stats = dict(_stats)
+
+    decided = stats.get("high", 0) + stats.get("low", 0)
+    total = decided + stats.get("llm", 0)
+    return {
+        "enabled": RISK_RULES_ENABLED,
+        "decided_high": stats.get("high", 0),
+        "decided_low": stats.get("low", 0),
+        "sent_to_llm": stats.get("llm", 0),
+        "decided_ratio": round(decided / total, 3) if total else 0.0
+    }
@@ -0,0 +1,116 @@
+# src/risk_engine/risk_scheduler.py
+
+import os
+import re
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =====================================================
+# CONFIG
+# =====================================================
+# Set RISK_PRIORITIZE=0 to assess clauses in document order
+RISK_PRIORITIZE = os.getenv("RISK_PRIORITIZE", "1").lower() in ("1", "true", "yes")
+
+# =====================================================
+# RISK PRIOR
+# =====================================================
+# Clause types most likely to carry high risk are assessed first
+CLAUSE_TYPE_PRIORITY = {
+    "Data Protection": 3.0,
+    "Liability": 3.0,
+    "Indemnity": 3.0,
+    "Confidentiality": 2.0,
+    "Termination": 2.0,
+    "IP": 2.0,
+    "SLA": 1.0,
+    "Payment": 1.0,
+    "Assignment": 1.0,
+    "Dispute Resolution": 0.5,
+    "Governing Law": 0.0,
+    "Other": 0.0
+}
+
+RISK_KEYWORDS_RE = re.compile(
+    r"\b(?:unlimited|indefinite\w*|perpetu\w*|irrevocabl\w*|sole discretion|without (?:notice|consent|limit\w*)|"
+    r"personal (?:data|information)|health|PHI|breach\w*|security incident|penalt\w*|"
+    r"waive\w*|exclusive|indemnif\w*|liab\w*|third[- ]part(?:y|ies)|transfer\w*|retain\w*)\b",
+    re.IGNORECASE
+)
+
+
+def risk_prior(clause):
+    """
+    Cheap estimate of how likely a clause is to be high risk: its
+    extracted clause_type plus risk keyword signals. Higher goes first.
+    """
+    prior = CLAUSE_TYPE_PRIORITY.get(clause.get("clause_type"), 0.5)
+    signals = len(RISK_KEYWORDS_RE.findall(clause.get("clause_text", "") or ""))
+    return prior + 0.5 * min(signals, 6)
+
+
+# =====================================================
+# PRIORITY EXECUTOR
+# =====================================================
+class PriorityExecutor:
+    """
+    Bounded worker pool that always starts the highest-priority pending
+    task next (FIFO among equal priorities). submit() returns a standard
+    concurrent.futures.Future.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix="worker"):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{thread_name_prefix}_{i}", daemon=True)
+            for i in range(max(1, max_workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, priority, fn, *args):
+        future = Future()
+        with self._cv:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            heapq.heappush(self._heap, (-priority, next(self._seq), future, fn, args))
+            self._cv.notify()
+        return future
+
+    def _work(self):
+        while True:
+            with self._cv:
+                while not self._heap and not self._shutdown:
+                    self._cv.wait()
+                if not self._heap:
+                    return
+                _, _, future, fn, args = heapq.heappop(self._heap)
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self, wait=True):
+        with self._cv:
+            self._shutdown = True
+            self._cv.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown(wait=True)
+        return False
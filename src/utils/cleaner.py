@@ -5,6 +5,14 @@ from pathlib import Path
 from dotenv import load_dotenv
 import json
 
+from src.clause_engine.clause_segmenter import segment_clauses
+
+# Real tokenizer when available; falls back to an estimate offline
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
+
 load_dotenv()
 RAW_DIR = os.getenv("RAW_DIR")
 PROCESSED_DIR = os.getenv("PROCESSED_DIR")
@@ -13,6 +21,12 @@ Path(PROCESSED_DIR).mkdir(parents=True, exist_ok=True)
 MAX_CHUNK = int(os.getenv("MAX_CHUNK_TOKENS"))
 OVERLAP = int(os.getenv("CHUNK_OVERLAP"))
 
+# Model-token budget per chunk for clause-aware chunking
+CHUNK_TOKEN_BUDGET = int(os.getenv("CHUNK_TOKEN_BUDGET", "6000"))
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "cl100k_base")
+
+_encoder = None
+
 def normalize_text(text: str) -> str:
     # Remove multiple empty lines
     t = re.sub(r'\r\n', '\n', text)
@@ -32,12 +46,107 @@ def chunk_text(text: str, max_tokens=MAX_CHUNK, overlap=OVERLAP):
         i = j - overlap if j - overlap > i else j
     return chunks
 
+# =====================================================
+# TOKEN COUNTING
+# =====================================================
+def _get_encoder():
+    global _encoder
+
+    if _encoder is None:
+        _encoder = False
+        if tiktoken is not None:
+            try:
+                _encoder = tiktoken.get_encoding(TOKENIZER_ENCODING)
+            except Exception as e:
+                print("⚠ Tokenizer unavailable, estimating token counts:", e)
+
+    return _encoder or None
+
+
+def count_tokens(text: str) -> int:
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    # ~4 characters per token for English legal text
+    return max(1, len(text) // 4)
+
+
+# =====================================================
+# CLAUSE-BOUNDARY-AWARE CHUNKING
+# =====================================================
+def _clause_units(text):
+    """
+    Splits text into units that must not be cut: whole numbered clauses
+    (with any section title or preamble before them) or, for unnumbered
+    contracts, paragraphs. Units concatenate back to the original text.
+    """
+    segments = segment_clauses(text)
+    if segments:
+        cuts = [0] + [seg["end"] for seg in segments[:-1]] + [len(text)]
+    else:
+        cuts = [0] + [m.end() for m in re.finditer(r"\n\n", text)] + [len(text)]
+
+    return [text[a:b] for a, b in zip(cuts, cuts[1:]) if text[a:b].strip()]
+
+
+def _split_oversized(unit, max_tokens):
+    # Sentence boundaries first, whole words as a last resort
+    pieces = re.split(r"(?<=[.;:])\s+", unit)
+    if len(pieces) == 1:
+        pieces = unit.split()
+
+    parts, current = [], ""
+    for piece in pieces:
+        candidate = f"{current} {piece}" if current else piece
+        if current and count_tokens(candidate) > max_tokens:
+            parts.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        parts.append(current)
+    return parts
+
+
+def chunk_by_clauses(text: str, max_tokens=CHUNK_TOKEN_BUDGET):
+    """
+    Packs whole clauses (paragraphs for unnumbered text) into chunks of at
+    most max_tokens model tokens. No overlap: a clause lives in exactly one
+    chunk, so nothing is sent or extracted twice. Only a single clause
+    larger than the budget is split, at sentence boundaries.
+    """
+    chunks = []
+    current, current_tokens = [], 0
+
+    for unit in _clause_units(text):
+        unit_tokens = count_tokens(unit)
+
+        if unit_tokens > max_tokens:
+            if current:
+                chunks.append("".join(current).strip())
+                current, current_tokens = [], 0
+            chunks.extend(p.strip() for p in _split_oversized(unit, max_tokens))
+            continue
+
+        if current and current_tokens + unit_tokens > max_tokens:
+            chunks.append("".join(current).strip())
+            current, current_tokens = [], 0
+
+        current.append(unit)
+        current_tokens += unit_tokens
+
+    if current:
+        chunks.append("".join(current).strip())
+
+    return [c for c in chunks if c]
+
+
 def process_all():
     for f in Path(RAW_DIR).glob("*.txt"):
         with open(f, "r", encoding="utf-8") as fh:
             raw = fh.read()
         txt = normalize_text(raw)
-        chunks = chunk_text(txt)
+        chunks = chunk_by_clauses(txt)
         out = {
             "source": str(f),
             "chunks": chunks,
@@ -0,0 +1,50 @@
+# tests/test_risk_cache.py
+
+import pytest
+
+from src.risk_engine import risk_cache
+
+BREACH_NOTICE = (
+    "The Provider shall notify the Customer in writing of any personal data breach "
+    "affecting Customer data without undue delay and in any event within 24 hours "
+    "of becoming aware of it. The notice shall describe the nature of the breach, the "
+    "categories and approximate number of data subjects and records concerned, the likely "
+    "consequences of the breach and the measures taken or proposed to address it, "
+    "including measures to mitigate its possible adverse effects, and the Provider "
+    "shall cooperate with the Customer and take such reasonable commercial steps as "
+    "are directed by the Customer to assist in the investigation of the breach."
+)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(risk_cache, "RISK_CACHE_PATH", tmp_path / "risk_cache.sqlite3")
+    monkeypatch.setattr(risk_cache, "RISK_CACHE_DISABLED", False)
+    monkeypatch.setattr(risk_cache, "_conn", None)
+    yield risk_cache
+    if risk_cache._conn is not None:
+        risk_cache._conn.close()
+        risk_cache._conn = None
+
+
+def test_reuses_risk_for_near_identical_clause(cache):
+    cache.store(BREACH_NOTICE, {"risk_level": "low", "explanation": "24h notice"}, "C1", "7.2")
+
+    reused = cache.lookup("7.2 " + BREACH_NOTICE.replace("The Provider", "Acme Ltd"))
+
+    assert reused["risk_level"] == "low"
+    assert reused["reused_from"]["contract_id"] == "C1"
+
+
+def test_different_figures_are_not_reused(cache, monkeypatch):
+    # Loose enough that the wording alone would count as a match
+    monkeypatch.setattr(cache, "RISK_CACHE_THRESHOLD", 0.8)
+    cache.store(BREACH_NOTICE, {"risk_level": "low", "explanation": "24h notice"}, "C1", "7.2")
+
+    assert cache.lookup(BREACH_NOTICE.replace("24 hours", "720 hours")) is None
+
+
+def test_negated_clause_is_not_reused(cache):
+    cache.store(BREACH_NOTICE, {"risk_level": "low", "explanation": "24h notice"}, "C1", "7.2")
+
+    assert cache.lookup(BREACH_NOTICE.replace("shall notify", "shall not notify")) is None
@@ -0,0 +1,62 @@
+# tests/test_rule_packs.py
+
+from src.regulatory.rule_packs import RulePackMatcher, compile_packs
+
+PACKS = [
+    {
+        "regulation": "ISO27001",
+        "required_clauses": [
+            {"name": "Incident Management", "indicators": ["information security incident"]}
+        ]
+    },
+    {
+        "regulation": "SOC2",
+        "required_clauses": [
+            {"name": "Incident Response", "indicators": ["security incident", "incident response plan"]},
+            {"name": "Incident Plan", "indicators": ["incident response"]}
+        ]
+    }
+]
+
+
+def _find(text, heading=None):
+    matcher = RulePackMatcher(compile_packs(PACKS))
+    return matcher.find_requirements([{"clause_id": "9.1", "clause_heading": heading, "clause_text": text}])
+
+
+def test_phrase_inside_longer_match_is_found():
+    found = _find("Supplier shall report any information security incident within 48 hours.")
+
+    assert found[("ISO27001", "Incident Management")] == ["9.1"]
+    assert found[("SOC2", "Incident Response")] == ["9.1"]
+
+
+def test_shorter_phrase_at_same_start_is_found():
+    found = _find("Supplier shall maintain an incident response plan.")
+
+    assert found[("SOC2", "Incident Response")] == ["9.1"]
+    assert found[("SOC2", "Incident Plan")] == ["9.1"]
+
+
+def test_phrases_need_whole_words():
+    assert _find("Supplier handles nonsecurity incidents.") == {}
+
+
+def test_phrase_in_negated_sentence_is_ignored():
+    found = _find(
+        "Supplier keeps audit logs. Supplier is not obligated to report any security incident."
+    )
+
+    assert ("SOC2", "Incident Response") not in found
+
+
+def test_obligation_wording_is_not_negation():
+    found = _find("Supplier shall report any security incident without undue delay.")
+
+    assert found[("SOC2", "Incident Response")] == ["9.1"]
+
+
+def test_heading_alone_is_not_evidence():
+    found = _find("9.1 Security Incident\nSupplier keeps audit logs.", heading="Security Incident")
+
+    assert found == {}